@@ -0,0 +1,197 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+from os import makedirs
+from os.path import join
+from random import Random
+from typing import Callable, Dict, List
+
+from benchmarks.world import SyntheticLevel, init_display
+
+import pygame
+
+from settings import *
+from src.support import import_folder_imgs
+from src.tile import Tile
+from src.weapon import Weapon
+
+BASE_COUNTS = {'tiles': 250, 'enemies': 10, 'particles': 10}
+RESULTS_PATH = './benchmarks/results'
+
+
+def measure(run: Callable, min_time: float, warmup: int = 5, reset: Callable = None) -> Dict[str, float]:
+    """Times run(), reset() puts the world back before each call and is not timed"""
+    for _ in range(warmup):
+        if reset:
+            reset()
+        run()
+
+    timings = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or len(timings) < 10:
+        if reset:
+            reset()
+        op_start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - op_start)
+
+    total = sum(timings)
+    return {
+        'ops_per_sec': len(timings) / total,
+        'mean_ms': total / len(timings) * 1000,
+        'min_ms': min(timings) * 1000,
+        'iterations': len(timings)
+    }
+
+
+def bench_move(level: SyntheticLevel) -> Callable:
+    random = Random(1)
+    enemies = level.enemies()
+
+    def run() -> None:
+        for enemy in enemies:
+            enemy.direction = pygame.math.Vector2(random.uniform(-1, 1), random.uniform(-1, 1))
+            enemy.move(enemy.speed)
+    return run
+
+
+def bench_collision(level: SyntheticLevel) -> Callable:
+    enemies = level.enemies()
+
+    def run() -> None:
+        for enemy in enemies:
+            enemy.collision('horizontal')
+            enemy.collision('vertical')
+    return run
+
+
+def bench_custom_draw(level: SyntheticLevel) -> Callable:
+    return lambda: level.visible_sprites.custom_draw(level.player)
+
+
+def bench_enemy_update(level: SyntheticLevel) -> Callable:
+    return lambda: level.enemy_sprites.enemy_update(level.player)
+
+
+def bench_enemy_sprites_update(level: SyntheticLevel) -> Callable:
+    # the AI step decides which monsters sleep, as it does every frame in Level.run
+    level.enemy_sprites.enemy_update(level.player)
+    return level.enemy_sprites.update
+
+
+def bench_player_attack_logic(level: SyntheticLevel):
+    # a weapon swing plus a flame cast, the usual worst case of attack sprites
+    level.player.energy = level.player.stats['energy']
+    level.current_attack = Weapon(level.player, [level.visible_sprites, level.attack_sprites])
+    level.magic_player.flame(level.player, 0, [level.visible_sprites, level.attack_sprites])
+
+    # grass and monsters under every attack, as many as the scale, so each call cuts and hits
+    random = Random(1)
+    targets_per_attack = max(1, level.enemy_count // BASE_COUNTS['enemies'])
+    grass_images = import_folder_imgs('./graphics/grass')
+    grass_groups = [level.visible_sprites, level.obstacle_sprites, level.attackable_sprites]
+    grass, enemies = [], []
+    for attack_sprite in level.attack_sprites:
+        x, y = attack_sprite.rect.topleft
+        for _ in range(targets_per_attack):
+            grass.append(Tile((x, y), grass_groups, 'grass', random.choice(grass_images)))
+            enemies.append(level.create_enemy(random.choice(list(ENEMY_MONSTERS_DATA)), (x, y)))
+    health = {enemy: enemy.health for enemy in enemies}
+
+    def reset() -> None:
+        for tile in grass:
+            if not tile.alive():
+                tile.add(grass_groups)
+        for enemy in enemies:
+            enemy.health = health[enemy]
+            enemy.vulnerable = True
+            enemy.hit_time = None
+
+    return level.player_attack_logic, reset
+
+
+def bench_ui_display(level: SyntheticLevel) -> Callable:
+    return lambda: level.ui.display(level.player)
+
+
+BENCHMARKS = {
+    'entity.move': bench_move,
+    'entity.collision': bench_collision,
+    'custom_draw': bench_custom_draw,
+    'enemy_update': bench_enemy_update,
+    'enemy_sprites.update': bench_enemy_sprites_update,
+    'player_attack_logic': bench_player_attack_logic,
+    'ui.display': bench_ui_display
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmarks(names: List[str], scales: List[int], min_time: float, entity_store: bool = False) -> Dict:
+    init_display()
+    results = {name: [] for name in names}
+
+    for scale in scales:
+        counts = {key: value * scale for key, value in BASE_COUNTS.items()}
+        for name in names:
+            # a fresh world per benchmark, attacks and particles change it
+            level = SyntheticLevel(**counts, entity_store=entity_store)
+            # a benchmark that changes the world also returns how to put it back
+            run = BENCHMARKS[name](level)
+            run, reset = run if isinstance(run, tuple) else (run, None)
+            stats = measure(run, min_time, reset=reset)
+            results[name].append({'scale': scale, **counts, **stats})
+            print(f'{name:<22} x{scale:<3} {stats["ops_per_sec"]:>10.1f} ops/s {stats["mean_ms"]:>9.3f} ms')
+
+    return {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'entity_store': entity_store,
+        'results': results
+    }
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+
+    print(f'{"benchmark":<22} {"scale":<6} {old["commit"]:>10} {new["commit"]:>10}  speedup')
+    for name, new_runs in new['results'].items():
+        old_runs = {run['scale']: run for run in old['results'].get(name, [])}
+        for run in new_runs:
+            if run['scale'] in old_runs:
+                old_ops = old_runs[run['scale']]['ops_per_sec']
+                speedup = run['ops_per_sec'] / old_ops
+                print(f'{name:<22} x{run["scale"]:<5} {old_ops:>10.1f} {run["ops_per_sec"]:>10.1f}  {speedup:.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Times the update and draw hot paths on synthetic worlds')
+    parser.add_argument('--bench', nargs='*', default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    parser.add_argument('--scales', default='1,2,4,8', help='multiples of the base tile/enemy/particle counts')
+    parser.add_argument('--min-time', type=float, default=.3, help='seconds spent on each measurement')
+    parser.add_argument('--entity-store', action='store_true', help='keep the monsters in an EntityStore')
+    parser.add_argument('--output', help='results file, defaults to benchmarks/results/<commit>.json')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='print the speedup between two results files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        report = run_benchmarks(args.bench, [int(scale) for scale in args.scales.split(',')], args.min_time, args.entity_store)
+        output = args.output
+        if not output:
+            makedirs(RESULTS_PATH, exist_ok=True)
+            output = join(RESULTS_PATH, f'{report["commit"]}.json')
+        with open(output, 'w') as results_file:
+            json.dump(report, results_file, indent=2)
+        print(f'results saved to {output}')
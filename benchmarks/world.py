@@ -0,0 +1,106 @@
+import os
+
+# benchmarks never open a window or a sound card
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from random import Random
+
+import pygame
+
+from settings import *
+from src.clock import FixedStepClock, set_clock
+from src.entity_store import EntityStore
+from src.level import Level
+from src.player.player import Player
+from src.support import import_folder_imgs
+from src.tile import Tile
+
+
+def init_display() -> pygame.Surface:
+    pygame.init()
+    set_clock(FixedStepClock())
+    return pygame.display.get_surface() or pygame.display.set_mode((WIDTH, HEIGTH))
+
+
+class SyntheticLevel(Level):
+    """A Level filled with random tiles, monsters and particles instead of the map"""
+
+    def __init__(
+        self,
+        tiles: int = 500,
+        enemies: int = 25,
+        particles: int = 20,
+        seed: int = 0,
+        entity_store: bool = False
+    ) -> None:
+        self.entity_store = entity_store
+        self.tile_count = tiles
+        self.enemy_count = enemies
+        self.particle_count = particles
+        self.random = Random(seed)
+
+        # a square world with room for everything and some free floor
+        cells = (tiles + enemies) * 3 + 64
+        self.world_cols = max(20, int(cells ** .5))
+
+        super().__init__()
+        self.create_particles()
+
+    def random_position(self):
+        col = self.random.randrange(self.world_cols)
+        row = self.random.randrange(self.world_cols)
+        return col * TILESIZE, row * TILESIZE
+
+    def create_world(self) -> None:
+        graphics = {
+            'grass': import_folder_imgs('./graphics/grass'),
+            'objects': import_folder_imgs('./graphics/objects')
+        }
+
+        center = self.world_cols * TILESIZE // 2
+        self.player = Player(
+            pos=(center, center),
+            groups=[self.visible_sprites],
+            obstacle_sprites=self.obstacle_sprites,
+            create_attack=self.create_attack,
+            destroy_attack=self.destroy_attack,
+            create_magic=self.create_magic
+        )
+
+        for index in range(self.tile_count):
+            if index % 2:
+                Tile(
+                    pos=self.random_position(),
+                    groups=[self.visible_sprites, self.obstacle_sprites, self.attackable_sprites],
+                    sprite_type='grass',
+                    surface=self.random.choice(graphics['grass'])
+                )
+            else:
+                Tile(
+                    pos=self.random_position(),
+                    groups=[self.visible_sprites, self.obstacle_sprites],
+                    sprite_type='object',
+                    surface=self.random.choice(graphics['objects'])
+                )
+
+        if self.entity_store:
+            self.enemy_sprites.store = EntityStore()
+        for _ in range(self.enemy_count):
+            self.create_enemy(self.random.choice(list(ENEMY_MONSTERS_DATA)), self.random_position())
+
+        self.obstacle_sprites.flush()
+
+    def create_particles(self) -> None:
+        # spread around the player so they are on screen
+        for _ in range(self.particle_count):
+            x = self.player.rect.centerx + self.random.randint(-WIDTH // 2, WIDTH // 2)
+            y = self.player.rect.centery + self.random.randint(-HEIGTH // 2, HEIGTH // 2)
+            self.animation_player.create_particles(
+                animation_type=self.random.choice(['flame', 'aura', 'heal', 'claw', 'slash', 'thunder']),
+                position=(x, y),
+                groups=[self.visible_sprites]
+            )
+
+    def enemies(self):
+        return self.enemy_sprites.sprites()
@@ -1,37 +1,157 @@
-import sys, pygame
+import os, sys, time, argparse, pygame
 
 from settings import *
+from src.clock import FixedStepClock, set_clock, tick
+from src.controls import ScriptedInput, set_input
 from src.level import Level
+from src.loader import AssetLoader
+from src.menus.loading import LoadingScreen
+from src.music import music
+from src.profiler import profiler
+from src.renderer import create_display, present
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        headless: bool = False,
+        script: ScriptedInput = None,
+        profile_path: str = None,
+        dirty_rects: bool = DIRTY_RECTS,
+        renderer: str = RENDERER,
+        defer_audio: bool = AUDIO_DEFERRED
+    ) -> None:
+        if headless:
+            # no window and no sound card, the frames are only simulated
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            set_clock(FixedStepClock(HEADLESS_STEP_MS))
+
+        if script:
+            set_input(script)
+
+        # F3 shows the timings, --profile also writes them out when the game closes
+        self.profile_path = profile_path
+        if profile_path:
+            profiler.start_recording()
+
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGTH))
+        # 'sdl2' draws with GPU textures, 'software' blits on the window surface
+        self.renderer = renderer
+        self.screen = create_display((WIDTH, HEIGTH), renderer)
         pygame.display.set_caption('A Dev Entures In Forest')
         self.clock = pygame.time.Clock()
+        self.script = script
+        self.frame = 0
 
+        # present only the changed areas instead of the whole window, the sdl2 renderer always presents it all
+        self.dirty_rects = dirty_rects and renderer == 'software'
+
+        # files are decoded on worker threads, the level starts once its surroundings are loaded
+        self.loader = AssetLoader()
+        self.loader.queue_level()
+        if headless:
+            self.loader.wait_ready()
+        else:
+            self.show_loading()
         self.level = Level()
 
-        # sound
-        main_sound = pygame.mixer.Sound('./audio/main.ogg')
-        main_sound.set_volume(.05)
-        main_sound.play(loops=-1)
+        # music is streamed, deferred it only starts once the first frame is on screen
+        music.play(self.level.music)
+        if not defer_audio:
+            music.start()
 
-    def run(self) -> None:
-        while True:
+    def show_loading(self) -> None:
+        loading_screen = LoadingScreen()
+        while not self.loader.ready:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
+
+            self.loader.poll()
+            loading_screen.draw(self.loader.progress)
+            present()
+            self.loader.wait(timeout=1 / FPS)
+
+    def step(self) -> None:
+        """Simulate and draw a single frame"""
+        with profiler.section('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
 
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_m:
                         self.level.toggle_menu()
-            
+                    if event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+
+        if self.script:
+            self.script.advance(self.frame)
+
+        # what the level did not need to start keeps coming in
+        if not self.loader.done:
+            with profiler.section('loader.poll'):
+                self.loader.poll()
+
+        with profiler.section('level.run'):
             self.screen.fill(WATER_COLOR)
             self.level.run()
-            pygame.display.update()
-            self.clock.tick(FPS)
+        overlay_rect = profiler.draw(self.screen)
+
+        with profiler.section('display.update'):
+            if self.dirty_rects and self.level.dirty_rects is not None:
+                rects = self.level.dirty_rects
+                if overlay_rect:
+                    rects = rects + [overlay_rect]
+                present(rects)
+            else:
+                present()
+
+        # a deferred start happens here, after the first frame is presented
+        music.start()
+        music.update()
+
+        tick()
+        self.frame += 1
+
+    def run(self) -> None:
+        while True:
+            self.step()
+            with profiler.section('clock.tick'):
+                self.clock.tick(FPS)
+            profiler.end_frame()
+
+    def quit(self) -> None:
+        if self.profile_path:
+            profiler.dump(self.profile_path)
+        pygame.quit()
+        sys.exit()
+
+    def run_frames(self, frames: int) -> float:
+        """Step as fast as possible, returns the seconds it took"""
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.step()
+            profiler.end_frame()
+        return time.perf_counter() - start
 
 if __name__ == '__main__':
-    Game().run()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true', help='run without window or sound on a fixed timestep')
+    parser.add_argument('--frames', type=int, default=600, help='frames to simulate in headless mode')
+    parser.add_argument('--script', help='json file with the keys held down per frame range')
+    parser.add_argument('--profile', help='write the frame timings to this .json or .csv file on exit')
+    parser.add_argument('--dirty-rects', action='store_true', default=DIRTY_RECTS, help='update only the changed parts of the window')
+    parser.add_argument('--renderer', choices=['software', 'sdl2'], default=RENDERER, help='draw on the window surface or with GPU textures')
+    args = parser.parse_args()
+
+    script = ScriptedInput.from_file(args.script) if args.script else None
+
+    if args.headless:
+        game = Game(headless=True, script=script, profile_path=args.profile, dirty_rects=args.dirty_rects, renderer=args.renderer)
+        elapsed = game.run_frames(args.frames)
+        print(f'{args.frames} frames in {elapsed:.3f}s ({args.frames / elapsed:.1f} fps)')
+        if args.profile:
+            profiler.dump(args.profile)
+    else:
+        Game(script=script, profile_path=args.profile, dirty_rects=args.dirty_rects, renderer=args.renderer).run()
@@ -1,6 +1,7 @@
 WIDTH = 1280
 HEIGTH = 720
 FPS = 60
+HEADLESS_STEP_MS = 1000 / FPS
 TILESIZE = 64
 HITBOX_OFFSET = {
     'player': -26,
@@ -9,13 +10,95 @@ HITBOX_OFFSET = {
     'invisible': 0
 }
 
+# Rendering
+STATIC_CHUNK_SIZE = 512
+PARTICLE_POOL_SIZE = 128
+ANIMATION_SPEED = .15
+DIRTY_RECTS = False
+RENDERER = 'software'
+RENDERER_ACCELERATED = True
+
+# Audio, the music of each level is streamed from disk
+MUSIC_TRACKS = {
+    'forest': './audio/main.ogg'
+}
+MUSIC_VOLUME = .05
+MUSIC_FADE_MS = 1000
+AUDIO_DEFERRED = True
+
+# Sound effects, at most 'voices' copies of one play together, 'cooldown' ms apart
+SOUND_VOLUME = .05
+SOUND_CHANNELS = 16
+SOUND_PLAYER_CHANNELS = 4
+SOUND_FALLOFF_DISTANCE = 800
+SOUND_EFFECTS = {
+    'sword': {'path': './audio/sword.wav', 'voices': 2, 'cooldown': 0},
+    'heal': {'path': './audio/heal.wav', 'voices': 1, 'cooldown': 0},
+    'flame': {'path': './audio/Fire.wav', 'voices': 2, 'cooldown': 0},
+    'hit': {'path': './audio/hit.wav', 'voices': 3, 'cooldown': 50},
+    'death': {'path': './audio/death.wav', 'voices': 3, 'cooldown': 50},
+    'slash': {'path': './audio/attack/slash.wav', 'voices': 2, 'cooldown': 150},
+    'claw': {'path': './audio/attack/claw.wav', 'voices': 2, 'cooldown': 150},
+    'fireball': {'path': './audio/attack/fireball.wav', 'voices': 2, 'cooldown': 150}
+}
+
+# Loading, image files and sounds are decoded on this many worker threads
+LOADER_WORKERS = 4
+
+# Map
+MAP_CSV_FOLDER = './map'
+MAP_BINARY_PATH = './map/map.bin'
+MAP_USE_MMAP = True
+
+# Entities layer ids, any other id is a squid
+PLAYER_ENTITY_ID = 394
+ENTITY_MONSTERS = {
+    390: 'bamboo',
+    391: 'spirit',
+    392: 'raccoon'
+}
+
+# World streaming, chunks are squares of WORLD_CHUNK_SIZE tiles
+WORLD_CHUNK_SIZE = 16
+WORLD_LOAD_RADIUS = 1
+WORLD_UNLOAD_RADIUS = 2
+
+# Enemy level of detail, idle monsters this far past their notice radius sleep
+ENEMY_WAKE_MARGIN = 128
+ENEMY_SLEEP_CHECK_FRAMES = 8
+
+# Monsters path around obstacles within this many tiles of the player
+FLOW_FIELD_RADIUS = 12
+
+# Keep monster state in numpy arrays and update it in batches
+ENTITY_STORE = False
+ENTITY_STORE_SIZE = 256
+
+# Atlas
+ATLAS_PATH = './graphics/atlas'
+ATLAS_WIDTH = 1024
+ATLAS_GROUPS = {
+    'player': './graphics/player',
+    'monsters': './graphics/monsters',
+    'particles': './graphics/particles',
+    'objects': './graphics/objects',
+    'grass': './graphics/grass'
+}
+
+# Profiler
+PROFILER_WINDOW = 300
+PROFILER_FONT_SIZE = 12
+PROFILER_OVERLAY_REFRESH = 30
+
 # UI
 BAR_HEIGHT = 20
 HEALTH_BAR_WIDTH = 200
 ENERGY_BAR_WIDTH = 140
+LOADING_BAR_WIDTH = 400
 ITEM_BOX_SIZE = 80
 UI_FONT = './graphics/font/joystix.ttf'
 UI_FONT_SIZE = 18
+UI_TEXT_CACHE_SIZE = 64
 
 # General colors
 WATER_COLOR = '#71ddee'
@@ -56,7 +139,7 @@ ENEMY_MONSTERS_DATA = {
         'exp':100,
         'damage': 20,
         'attack_type': 'slash',
-        'attack_sound':'./audio/attack/slash.wav',
+        'attack_sound': 'slash',
         'speed': 3,
         'resistance': 3,
         'attack_radius': 80,
@@ -67,7 +150,7 @@ ENEMY_MONSTERS_DATA = {
         'exp':250,
         'damage': 40,
         'attack_type': 'claw',
-        'attack_sound':'./audio/attack/claw.wav',
+        'attack_sound': 'claw',
         'speed': 2,
         'resistance': 3,
         'attack_radius': 120,
@@ -78,7 +161,7 @@ ENEMY_MONSTERS_DATA = {
         'exp':110,
         'damage': 8,
         'attack_type': 'thunder',
-        'attack_sound':'./audio/attack/fireball.wav',
+        'attack_sound': 'fireball',
         'speed': 4,
         'resistance': 3,
         'attack_radius': 60,
@@ -89,7 +172,7 @@ ENEMY_MONSTERS_DATA = {
         'exp':120,
         'damage': 6,
         'attack_type': 'leaf_attack',
-        'attack_sound':'./audio/attack/slash.wav',
+        'attack_sound': 'slash',
         'speed': 3,
         'resistance': 3,
         'attack_radius': 50,
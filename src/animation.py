@@ -0,0 +1,62 @@
+from math import sin
+from typing import Dict, List, Tuple
+from weakref import WeakKeyDictionary
+
+from pygame.surface import Surface
+
+from settings import *
+from src.clock import get_ticks
+
+
+class AnimationClock:
+    """Counts simulated frames for every animation of the level.
+
+    An animated object only remembers the frame its animation started on,
+    the frame to show comes from a schedule shared by every animation with
+    the same length and speed. The hit flicker alpha is computed once per
+    frame instead of once per flickering sprite.
+    """
+
+    def __init__(self) -> None:
+        self.frame = 0
+        self.flicker_alpha = 255
+        self.schedules: Dict[Tuple[int, float], List[int]] = {}
+        # shared frame -> {alpha: faded copy}
+        self.faded_images = WeakKeyDictionary()
+
+    def advance(self) -> None:
+        self.frame += 1
+        self.flicker_alpha = 255 if sin(get_ticks()) >= 0 else 0
+
+    def schedule(self, frame_count: int, speed: float = ANIMATION_SPEED) -> List[int]:
+        """Image index for each frame of one loop of an animation"""
+        key = (frame_count, speed)
+        schedule = self.schedules.get(key)
+        if schedule is None:
+            # summed like the old per-object frame_index, so the frames fall on the same steps
+            schedule = [0]
+            frame_index = speed
+            while frame_index < frame_count:
+                schedule.append(int(frame_index))
+                frame_index += speed
+            self.schedules[key] = schedule
+        return schedule
+
+    def frame_index(self, start: int, frame_count: int, speed: float = ANIMATION_SPEED) -> Tuple[int, int]:
+        """Image to show for an animation started at start, and the frame its current loop started"""
+        schedule = self.schedule(frame_count, speed)
+        loops, step = divmod(self.frame - start, len(schedule))
+        return schedule[step], start + loops * len(schedule)
+
+    def faded(self, image: Surface, alpha: int) -> Surface:
+        """A shared frame drawn with alpha, each faded copy is made once and keeps its texture"""
+        if alpha == 255:
+            return image
+        copies = self.faded_images.setdefault(image, {})
+        if alpha not in copies:
+            copies[alpha] = image.copy()
+            copies[alpha].set_alpha(alpha)
+        return copies[alpha]
+
+
+animation_clock = AnimationClock()
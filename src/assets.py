@@ -0,0 +1,139 @@
+import json
+from concurrent.futures import Future
+from glob import glob
+from os import walk
+from os.path import join, normpath
+from typing import Callable, Dict, Hashable, List
+
+import pygame
+from pygame.surface import Surface
+
+from settings import *
+
+
+def sort_img_files(path: str, img_files: List[str]) -> List[str]:
+    # objects are picked by their number in the map, keep them in numeric order
+    if 'objects' in path:
+        return sorted(img_files, key=lambda filename: int(filename.split('.')[0]))
+    return sorted(img_files)
+
+
+class AssetCache:
+    """Load-once registry for surfaces, frame lists and sounds.
+
+    Everything handed out is shared, callers must copy a surface before
+    changing it (``set_alpha``, drawing on it...).
+    """
+
+    def __init__(self) -> None:
+        self.assets: Dict[Hashable, object] = {}
+        self.sizes: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.atlas_index = None
+        # files decoded ahead of time by src.loader, path -> Future
+        self.prefetched: Dict[str, Future] = {}
+
+    def get(self, key: Hashable, loader: Callable):
+        if key in self.assets:
+            self.hits += 1
+            return self.assets[key]
+
+        self.misses += 1
+        asset = loader()
+        self.assets[key] = asset
+        self.sizes[key] = self.size_of(asset)
+        return asset
+
+    def prefetch(self, path: str, future: Future) -> None:
+        self.prefetched[normpath(path)] = future
+
+    def decode(self, path: str, load: Callable):
+        """A file's content, from the worker that prefetched it or read right away"""
+        future = self.prefetched.pop(normpath(path), None)
+        if future is not None:
+            return future.result()
+        return load(path)
+
+    def image(self, path: str, alpha: bool = True) -> Surface:
+        def load() -> Surface:
+            surface = self.decode(path, pygame.image.load)
+            return surface.convert_alpha() if alpha else surface.convert()
+
+        return self.get(('image', normpath(path), alpha), load)
+
+    def frames(self, path: str) -> List[Surface]:
+        def load() -> List[Surface]:
+            atlas = self.get_atlas_index().get(normpath(path))
+            if atlas:
+                return self.load_atlas_imgs(*atlas)
+            return self.load_folder_imgs(path)
+
+        return self.get(('frames', normpath(path)), load)
+
+    def get_atlas_index(self) -> Dict:
+        """Folder -> (sheet path, frame rects) of every atlas built by src.atlas"""
+        if self.atlas_index is None:
+            self.atlas_index = {}
+            for index_path in sorted(glob(join(ATLAS_PATH, '*.json'))):
+                with open(index_path) as index_file:
+                    index = json.load(index_file)
+
+                sheet_path = join(ATLAS_PATH, index['sheet'])
+                for folder, frame_rects in index['folders'].items():
+                    self.atlas_index[folder] = (sheet_path, frame_rects)
+
+        return self.atlas_index
+
+    def load_atlas_imgs(self, sheet_path: str, frame_rects: List) -> List[Surface]:
+        sheet = self.image(sheet_path)
+        return [sheet.subsurface(frame_rect) for frame_rect in frame_rects]
+
+    def sound(self, path: str, volume: float = None) -> pygame.mixer.Sound:
+        def load() -> pygame.mixer.Sound:
+            sound = self.decode(path, pygame.mixer.Sound)
+            if volume is not None:
+                sound.set_volume(volume)
+            return sound
+
+        return self.get(('sound', normpath(path)), load)
+
+    def load_folder_imgs(self, path: str) -> List[Surface]:
+        surface_list = []
+
+        for _, _, img_files in walk(path):
+            for img in sort_img_files(path, img_files):
+                full_path = path + '/' + img
+                img_surface = self.decode(full_path, pygame.image.load).convert_alpha()
+                surface_list.append(img_surface)
+
+        return surface_list
+
+    def size_of(self, asset) -> int:
+        if isinstance(asset, Surface):
+            return asset.get_bytesize() * asset.get_width() * asset.get_height()
+        if isinstance(asset, pygame.mixer.Sound):
+            return len(asset.get_raw())
+        if isinstance(asset, (list, tuple)):
+            return sum(self.size_of(item) for item in asset)
+        return 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'assets': len(self.assets),
+            'bytes': sum(self.sizes.values())
+        }
+
+    def clear(self) -> None:
+        self.assets.clear()
+        self.sizes.clear()
+        self.hits = 0
+        self.misses = 0
+        self.atlas_index = None
+        self.prefetched.clear()
+
+
+# shared by the whole process
+assets = AssetCache()
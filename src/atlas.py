@@ -0,0 +1,85 @@
+# Packs every animation folder of a graphics group into one sheet, run
+# `make atlas` after changing any frame
+import json
+from os import listdir, makedirs
+from os.path import isdir, isfile, join, normpath
+from typing import Dict, List, Tuple
+
+import pygame
+from pygame.surface import Surface
+
+from settings import *
+from src.assets import sort_img_files
+
+
+def find_frame_folders(root: str) -> List[str]:
+    """Folders with images and no subfolders, the ones import_folder_imgs loads"""
+    folders = []
+    entries = sorted(listdir(root))
+
+    subfolders = [join(root, entry) for entry in entries if isdir(join(root, entry))]
+    if subfolders:
+        for subfolder in subfolders:
+            folders += find_frame_folders(subfolder)
+    elif any(entry.endswith('.png') for entry in entries):
+        folders.append(normpath(root))
+
+    return folders
+
+
+def pack(sizes: List[Tuple[int, int]], width: int) -> Tuple[List[Tuple[int, int]], int]:
+    """Shelf packing, tallest images first, returns the positions in input order"""
+    positions = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda index: sizes[index][1], reverse=True)
+
+    x = y = shelf_height = 0
+    for index in order:
+        w, h = sizes[index]
+        if x + w > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+
+        positions[index] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+
+    return positions, y + shelf_height
+
+
+def build_atlas(name: str, root: str, output_path: str = ATLAS_PATH) -> Dict:
+    images = []
+    for folder in find_frame_folders(root):
+        img_files = [entry for entry in listdir(folder) if isfile(join(folder, entry))]
+        for img in sort_img_files(folder, img_files):
+            images.append((folder, pygame.image.load(join(folder, img))))
+
+    sizes = [surface.get_size() for _, surface in images]
+    width = max([ATLAS_WIDTH] + [w for w, _ in sizes])
+    positions, height = pack(sizes, width)
+
+    # additive blit copies the pixels as they are onto the transparent sheet
+    sheet = Surface((width, height), pygame.SRCALPHA)
+    index = {'sheet': f'{name}.png', 'folders': {}}
+    for (folder, surface), position in zip(images, positions):
+        sheet.blit(surface, position, special_flags=pygame.BLEND_RGBA_ADD)
+        frame_rect = [position[0], position[1], surface.get_width(), surface.get_height()]
+        index['folders'].setdefault(folder, []).append(frame_rect)
+
+    makedirs(output_path, exist_ok=True)
+    pygame.image.save(sheet, join(output_path, f'{name}.png'))
+    with open(join(output_path, f'{name}.json'), 'w') as index_file:
+        json.dump(index, index_file, indent=1)
+
+    return index
+
+
+def build_all(output_path: str = ATLAS_PATH) -> None:
+    for name, root in ATLAS_GROUPS.items():
+        index = build_atlas(name, root, output_path)
+        frame_count = sum(len(frames) for frames in index['folders'].values())
+        print(f'{name}: {len(index["folders"])} folders, {frame_count} frames')
+
+
+if __name__ == '__main__':
+    build_all()
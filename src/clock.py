@@ -0,0 +1,46 @@
+import pygame
+
+from settings import *
+
+
+class WallClock:
+    """Milliseconds since pygame.init, what the game uses by default"""
+
+    def get_ticks(self) -> int:
+        return pygame.time.get_ticks()
+
+    def tick(self) -> None:
+        pass
+
+
+class FixedStepClock:
+    """Advances a fixed amount per frame, so a run is the same however fast it goes"""
+
+    def __init__(self, step_ms: float = 1000 / FPS, start_ms: float = 0) -> None:
+        self.step_ms = step_ms
+        self.time = start_ms
+        self.frame = 0
+
+    def get_ticks(self) -> int:
+        return int(self.time)
+
+    def tick(self) -> None:
+        self.time += self.step_ms
+        self.frame += 1
+
+
+game_clock = WallClock()
+
+
+def get_ticks() -> int:
+    """Timer source for every cooldown, use instead of pygame.time.get_ticks"""
+    return game_clock.get_ticks()
+
+
+def tick() -> None:
+    game_clock.tick()
+
+
+def set_clock(clock) -> None:
+    global game_clock
+    game_clock = clock
@@ -0,0 +1,64 @@
+import json
+from typing import Dict, Iterable, List
+
+import pygame
+
+
+class ScriptedKeys:
+    """Stands in for the sequence returned by pygame.key.get_pressed"""
+
+    def __init__(self, pressed: Iterable[int] = ()) -> None:
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+class ScriptedInput:
+    """Keys held down per frame range, e.g. [{'frames': [0, 60], 'keys': ['K_RIGHT']}]"""
+
+    def __init__(self, script: List[Dict]) -> None:
+        self.script = [
+            (step['frames'][0], step['frames'][1], [getattr(pygame, key) for key in step['keys']])
+            for step in script
+        ]
+        self.frame = 0
+        self.keys = ScriptedKeys()
+        self.advance(0)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ScriptedInput':
+        with open(path) as script_file:
+            return cls(json.load(script_file))
+
+    def advance(self, frame: int) -> None:
+        self.frame = frame
+        pressed = set()
+        for start, end, keys in self.script:
+            if start <= frame < end:
+                pressed.update(keys)
+        self.keys = ScriptedKeys(pressed)
+
+    def get_pressed(self):
+        return self.keys
+
+
+class KeyboardInput:
+    def advance(self, frame: int) -> None:
+        pass
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+
+input_source = KeyboardInput()
+
+
+def get_pressed():
+    """Keys held down this frame, use instead of pygame.key.get_pressed"""
+    return input_source.get_pressed()
+
+
+def set_input(source) -> None:
+    global input_source
+    input_source = source
@@ -4,6 +4,9 @@ import pygame
 from pygame.sprite import AbstractGroup
 
 from settings import *
+from src.animation import animation_clock
+from src.clock import get_ticks
+from src.sounds import sounds
 from src.support import *
 from src.entity import Entity
 from src.player.player import Player
@@ -28,7 +31,7 @@ class Enemy(Entity):
         # Graphics Setup
         self.import_graphics(monster_name)
         self.status = 'idle'
-        self.image = self.animations[self.status][self.frame_index]
+        self.image = self.animations[self.status][0]
 
         # Movement
         self.rect = self.image.get_rect(topleft = position)
@@ -60,13 +63,8 @@ class Enemy(Entity):
         self.hit_time = None
         self.invincibility_duration = 300
 
-        # Sounds
-        self.death_sound = pygame.mixer.Sound('./audio/death.wav')
-        self.hit_sound = pygame.mixer.Sound('./audio/hit.wav')
-        self.attack_sound = pygame.mixer.Sound(monster_info['attack_sound'])
-        self.death_sound.set_volume(.05)
-        self.hit_sound.set_volume(.05)
-        self.attack_sound.set_volume(.05)
+        # Sounds, played through the shared SoundManager
+        self.attack_sound = monster_info['attack_sound']
 
     def import_graphics(self, monster_name: str) -> None:
         self.animations = {
@@ -98,45 +96,51 @@ class Enemy(Entity):
         distance_of_player = self.get_player_distance_direction(player)[0]
 
         if distance_of_player <= self.attack_radius and self.can_attack:
-            if self.status != 'attack':
-                self.frame_index = 0
-            self.status = 'attack'
+            self.set_status('attack')
         elif distance_of_player <= self.notice_radius:
-            self.status = 'move'
+            self.set_status('move')
         else:
-            self.status = 'idle'
+            self.set_status('idle')
+
+    def set_status(self, status: str) -> None:
+        if status != self.status:
+            self.animation_start = animation_clock.frame
+        self.status = status
     
     def actions(self, player) -> None:
         if self.status == 'attack':
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = get_ticks()
             self.damage_player(
                 self.attack_damage, self.attack_type
             )
-            self.attack_sound.play()
+            sounds.play(self.attack_sound, self.rect.center)
         elif self.status == 'move':
             self.direction = self.get_player_distance_direction(player)[1]
         else:
             self.direction = pygame.math.Vector2()
 
     def animate(self) -> None:
-        animation = self.animations[self.status]
-        self.frame_index += self.animation_speed
-        if self.frame_index >= len(animation):
+        frame_index, loop_start = animation_clock.frame_index(
+            self.animation_start, len(self.animations[self.status]), self.animation_speed
+        )
+        if loop_start != self.animation_start:
+            # an attack ends with its animation
             if self.status == 'attack':
                 self.can_attack = False
-            self.frame_index = 0
-        
-        self.image = animation[int(self.frame_index)]
+            self.animation_start = loop_start
+
+        self.show_frame(frame_index)
+
+    def show_frame(self, frame: int) -> None:
+        self.image = self.animations[self.status][frame]
         self.rect = self.image.get_rect(center = self.hitbox.center)
 
+        # frames are shared by every monster of this type, flicker with a faded copy made once
         if not self.vulnerable:
-            alpha = self.wave_value()
-            self.image.set_alpha(alpha)
-        else:
-            self.image.set_alpha(255)
+            self.image = animation_clock.faded(self.image, self.wave_value())
 
     def cooldowns(self) -> None:
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
 
         if not self.can_attack:
             if current_time - self.attack_time >= self.attack_cooldown:
@@ -148,7 +152,7 @@ class Enemy(Entity):
 
     def get_damage(self, player: Player, attack_type) -> None:
         if self.vulnerable:
-            self.hit_sound.play()
+            sounds.play('hit', self.rect.center)
             self.direction = self.get_player_distance_direction(player)[1]
 
             if attack_type == 'weapon':
@@ -156,7 +160,7 @@ class Enemy(Entity):
             else:
                 self.health -= player.get_full_magic_damage()
                 # magic damage
-            self.hit_time = pygame.time.get_ticks()
+            self.hit_time = get_ticks()
             self.vulnerable = False
     
     def check_death(self) -> None:
@@ -167,7 +171,7 @@ class Enemy(Entity):
                 self.monster_name
             )
             self.add_xp(self.exp)
-            self.death_sound.play()
+            sounds.play('death', self.rect.center)
 
     def hit_reaction(self) -> None:
         if not self.vulnerable:
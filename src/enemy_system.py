@@ -0,0 +1,186 @@
+import numpy as np
+import pygame
+
+from settings import *
+from src.animation import animation_clock
+from src.clock import get_ticks
+
+# simulation level of detail of a monster
+AWAKE = 0     # full update and AI every frame
+ANIMATED = 1  # idle on screen, only the animation runs
+SLEEPING = 2  # idle off screen, nothing runs until the player comes near
+
+
+class EnemyGroup(pygame.sprite.Group):
+    """Every enemy of the level, with their AI step done for all of them at once.
+
+    Monsters further than their notice radius plus ENEMY_WAKE_MARGIN that
+    have no hit or attack cooldown running are idle, so they only animate
+    while on screen and sleep otherwise. Sleeping monsters are looked at every
+    ENEMY_SLEEP_CHECK_FRAMES frames, the margin covers what the player can
+    walk in between.
+
+    With an EntityStore the monsters are StoredEnemy views and their update
+    runs as array operations over the store instead of one call each. With a
+    FlowField the monsters walk around obstacles instead of straight at the
+    player.
+    """
+
+    def __init__(self, *sprites, store = None, flow_field = None) -> None:
+        self.store = store
+        self.flow_field = flow_field
+        self.enemy_list = []
+        self.slots = np.empty(0, dtype=np.intp)
+        self.attack_radius = np.empty(0)
+        self.notice_radius = np.empty(0)
+        self.lod = np.empty(0, dtype=np.int8)
+        self.awake_indexes = np.empty(0, dtype=np.intp)
+        self.animated_indexes = np.empty(0, dtype=np.intp)
+        self.awake_enemies = []
+        self.animated_enemies = []
+        self.frame = 0
+        self.changed = True
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None) -> None:
+        super().add_internal(sprite, layer)
+        self.changed = True
+
+    def remove_internal(self, sprite) -> None:
+        super().remove_internal(sprite)
+        if self.store is not None:
+            self.store.release(sprite.slot)
+        self.changed = True
+
+    def rebuild_arrays(self) -> None:
+        # radii only change when enemies join or leave the group
+        self.enemy_list = self.sprites()
+        self.attack_radius = np.array([enemy.attack_radius for enemy in self.enemy_list], dtype=float)
+        self.notice_radius = np.array([enemy.notice_radius for enemy in self.enemy_list], dtype=float)
+        if self.store is not None:
+            self.slots = np.array([enemy.slot for enemy in self.enemy_list], dtype=np.intp)
+
+        # everyone is awake until the next AI step has looked at them
+        self.lod = np.full(len(self.enemy_list), AWAKE, dtype=np.int8)
+        self.set_lod_lists()
+        self.changed = False
+
+    def set_lod_lists(self) -> None:
+        enemies = self.enemy_list
+        self.awake_indexes = np.flatnonzero(self.lod == AWAKE)
+        self.animated_indexes = np.flatnonzero(self.lod == ANIMATED)
+        self.awake_enemies = [enemies[index] for index in self.awake_indexes]
+        self.animated_enemies = [enemies[index] for index in self.animated_indexes]
+
+    def update(self) -> None:
+        if self.changed:
+            self.rebuild_arrays()
+
+        if self.store is not None:
+            self.update_stored()
+            return
+
+        for enemy in self.awake_enemies:
+            enemy.update()
+
+        # an idle monster stands still with nothing to cool down, update() would only animate it
+        for enemy in self.animated_enemies:
+            enemy.animate()
+
+    def update_stored(self) -> None:
+        """Enemy.update for the awake monsters and Enemy.animate for the animated ones, step by step for all of them"""
+        store = self.store
+        enemies = self.enemy_list
+        awake_indexes = self.awake_indexes
+        awake_slots = self.slots[awake_indexes]
+
+        # hit reaction and movement, only the collisions are left per monster
+        store.hit_reaction(awake_slots)
+        store.normalize(awake_slots)
+        for index, (x, y) in zip(awake_indexes.tolist(), store.steps(awake_slots).tolist()):
+            if x or y:
+                enemies[index].move_by(x, y)
+
+        # animation
+        indexes = np.concatenate([awake_indexes, self.animated_indexes])
+        slots = self.slots[indexes]
+        statuses = [enemies[index].status for index in indexes]
+        schedules = [
+            animation_clock.schedule(len(enemies[index].animations[status]), speed)
+            for index, status, speed in zip(indexes, statuses, store.arrays['animation_speed'][slots].tolist())
+        ]
+        loop_lengths = np.fromiter((len(schedule) for schedule in schedules), dtype=int, count=len(indexes))
+        steps, wrapped = store.animation_steps(slots, loop_lengths, animation_clock.frame)
+        attacks = np.fromiter((status == 'attack' for status in statuses), dtype=bool, count=len(indexes))
+        store.arrays['can_attack'][slots[wrapped & attacks]] = False
+
+        for index, schedule, step in zip(indexes.tolist(), schedules, steps.tolist()):
+            enemies[index].show_frame(schedule[step])
+
+        # cooldowns and death
+        store.cooldowns(awake_slots, get_ticks())
+        for index in awake_indexes[store.arrays['health'][awake_slots] <= 0]:
+            enemies[index].check_death()
+
+    def enemy_update(self, player) -> None:
+        if self.changed:
+            self.rebuild_arrays()
+
+        enemies = self.enemy_list
+        if not enemies:
+            return
+
+        self.frame += 1
+        if self.frame % ENEMY_SLEEP_CHECK_FRAMES:
+            indexes = np.flatnonzero(self.lod != SLEEPING)
+        else:
+            indexes = np.arange(len(enemies))
+        count = len(indexes)
+        if not count:
+            return
+
+        # distance and direction from every enemy to the player in one pass
+        centers = np.array([enemies[index].rect.center for index in indexes], dtype=float)
+        deltas = np.array(player.rect.center, dtype=float) - centers
+        distances = np.hypot(deltas[:, 0], deltas[:, 1])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            directions = np.where(distances[:, None] > 0, deltas / distances[:, None], 0.0)
+
+        if self.store is not None:
+            can_attack = self.store.arrays['can_attack'][self.slots[indexes]]
+            vulnerable = self.store.arrays['vulnerable'][self.slots[indexes]]
+        else:
+            can_attack = np.fromiter((enemies[index].can_attack for index in indexes), dtype=bool, count=count)
+            vulnerable = np.fromiter((enemies[index].vulnerable for index in indexes), dtype=bool, count=count)
+        attacking = can_attack & (distances <= self.attack_radius[indexes])
+        moving = ~attacking & (distances <= self.notice_radius[indexes])
+        idle = ~(attacking | moving)
+
+        if self.flow_field is not None and moving.any():
+            self.flow_field.update(player.hitbox.center)
+            directions[moving] = self.flow_field.sample(centers[moving], directions[moving])
+
+        # write the results back, same as Enemy.get_status + Enemy.actions
+        for index in np.flatnonzero(attacking):
+            enemy = enemies[indexes[index]]
+            enemy.set_status('attack')
+            enemy.actions(player)
+
+        for index in np.flatnonzero(moving):
+            enemy = enemies[indexes[index]]
+            enemy.set_status('move')
+            enemy.direction = pygame.math.Vector2(directions[index, 0], directions[index, 1])
+
+        for index in np.flatnonzero(idle):
+            enemy = enemies[indexes[index]]
+            enemy.set_status('idle')
+            enemy.direction = pygame.math.Vector2()
+
+        # level of detail for the next frame, the camera is centered on the player
+        awake = (distances <= self.notice_radius[indexes] + ENEMY_WAKE_MARGIN) | ~can_attack | ~vulnerable
+        on_screen = (
+            (np.abs(deltas[:, 0]) <= WIDTH // 2 + ENEMY_WAKE_MARGIN) &
+            (np.abs(deltas[:, 1]) <= HEIGTH // 2 + ENEMY_WAKE_MARGIN)
+        )
+        self.lod[indexes] = np.where(awake, AWAKE, np.where(on_screen, ANIMATED, SLEEPING))
+        self.set_lod_lists()
@@ -1,15 +1,17 @@
-from math import sin
-
 import pygame
 from pygame.sprite import AbstractGroup
 
+from settings import *
+from src.animation import animation_clock
+
 
 class Entity(pygame.sprite.Sprite):
     def __init__(self, *groups: AbstractGroup) -> None:
         super().__init__(*groups)
 
-        self.frame_index = 0
-        self.animation_speed = 0.15
+        # the frame the current animation started on, see AnimationClock
+        self.animation_start = animation_clock.frame
+        self.animation_speed = ANIMATION_SPEED
         self.direction = pygame.math.Vector2()
     
     def move(self, speed) -> None:
@@ -17,17 +19,24 @@ class Entity(pygame.sprite.Sprite):
         if self.direction.magnitude() != 0: # To player not run more faster on diagonal
             self.direction = self.direction.normalize()
 
-        self.hitbox.x += self.direction.x * speed
+        self.move_by(self.direction.x * speed, self.direction.y * speed)
+
+    def move_by(self, x, y) -> None:
+        """Move the hitbox by an already scaled step, stopping at obstacles"""
+        self.hitbox.x += x
         self.collision('horizontal')
-        self.hitbox.y += self.direction.y * speed
+        self.hitbox.y += y
         self.collision('vertical')
 
         self.rect.center = self.hitbox.center 
 
     def collision(self, direction) -> None:
         """Generate the player hitbox to collisions"""
+        # only the obstacles sharing a grid cell with the hitbox can collide
+        nearby_obstacles = self.obstacle_sprites.query(self.hitbox)
+
         if direction == 'horizontal':
-            for sprite in self.obstacle_sprites:
+            for sprite in nearby_obstacles:
                 if sprite.hitbox.colliderect(self.hitbox):
                     if self.direction.x > 0: # moving right
                         self.hitbox.right = sprite.hitbox.left
@@ -35,7 +44,7 @@ class Entity(pygame.sprite.Sprite):
                         self.hitbox.left = sprite.hitbox.right
 
         if direction == 'vertical':
-            for sprite in self.obstacle_sprites:
+            for sprite in nearby_obstacles:
                 if sprite.hitbox.colliderect(self.hitbox):
                     if self.direction.y > 0: # moving down
                         self.hitbox.bottom = sprite.hitbox.top
@@ -43,9 +52,4 @@ class Entity(pygame.sprite.Sprite):
                         self.hitbox.top = sprite.hitbox.bottom
 
     def wave_value(self):
-        value = sin(pygame.time.get_ticks())
-
-        if value >= 0:
-            return 255
-        else:
-            return 0
+        return animation_clock.flicker_alpha
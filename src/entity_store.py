@@ -0,0 +1,149 @@
+from math import isnan
+
+import numpy as np
+import pygame
+
+from settings import *
+from src.enemy import Enemy
+
+# name: (dtype, columns)
+STORE_FIELDS = {
+    'direction': (float, 2),
+    'speed': (float, 1),
+    'resistance': (float, 1),
+    'health': (float, 1),
+    'animation_start': (int, 1),
+    'animation_speed': (float, 1),
+    'can_attack': (bool, 1),
+    'attack_time': (float, 1),
+    'attack_cooldown': (float, 1),
+    'vulnerable': (bool, 1),
+    'hit_time': (float, 1),
+    'invincibility_duration': (float, 1)
+}
+
+
+class EntityStore:
+    """Monster state in contiguous arrays, one slot per monster.
+
+    StoredEnemy reads and writes its slot through the attributes it always
+    had, while EnemyGroup runs the per-frame work (hit reaction, direction
+    normalizing, animation loops, cooldowns) for all slots at once.
+    """
+
+    def __init__(self, capacity: int = ENTITY_STORE_SIZE) -> None:
+        self.arrays = {name: self.empty(name, capacity) for name in STORE_FIELDS}
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    def empty(self, name: str, capacity: int) -> np.ndarray:
+        dtype, columns = STORE_FIELDS[name]
+        shape = (capacity, columns) if columns > 1 else capacity
+        return np.zeros(shape, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.arrays['health']) - len(self.free_slots)
+
+    def grow(self) -> None:
+        capacity = len(self.arrays['health'])
+        for name, values in self.arrays.items():
+            self.arrays[name] = np.concatenate([values, self.empty(name, capacity)])
+        self.free_slots += range(capacity * 2 - 1, capacity - 1, -1)
+
+    def allocate(self) -> int:
+        if not self.free_slots:
+            self.grow()
+        return self.free_slots.pop()
+
+    def release(self, slot: int) -> None:
+        self.free_slots.append(slot)
+
+    def hit_reaction(self, slots: np.ndarray) -> None:
+        hurt = slots[~self.arrays['vulnerable'][slots]]
+        self.arrays['direction'][hurt] *= -self.arrays['resistance'][hurt, None]
+
+    def normalize(self, slots: np.ndarray) -> None:
+        # same operations as Vector2.normalize, so the result is bit for bit the same
+        direction = self.arrays['direction']
+        x, y = direction[slots, 0], direction[slots, 1]
+        length = np.sqrt(x * x + y * y)
+        moving = length != 0
+        direction[slots[moving]] /= length[moving, None]
+
+    def steps(self, slots: np.ndarray) -> np.ndarray:
+        return self.arrays['direction'][slots] * self.arrays['speed'][slots, None]
+
+    def animation_steps(self, slots: np.ndarray, loop_lengths: np.ndarray, current_frame: int):
+        """Step of each animation loop, and where a loop ended, as AnimationClock.frame_index"""
+        animation_start = self.arrays['animation_start']
+        loops, steps = np.divmod(current_frame - animation_start[slots], loop_lengths)
+        animation_start[slots] += loops * loop_lengths
+        return steps, loops != 0
+
+    def cooldowns(self, slots: np.ndarray, current_time: float) -> None:
+        arrays = self.arrays
+        with np.errstate(invalid='ignore'):
+            attack_ready = current_time - arrays['attack_time'][slots] >= arrays['attack_cooldown'][slots]
+            hit_over = current_time - arrays['hit_time'][slots] >= arrays['invincibility_duration'][slots]
+        arrays['can_attack'][slots[~arrays['can_attack'][slots] & attack_ready]] = True
+        arrays['vulnerable'][slots[~arrays['vulnerable'][slots] & hit_over]] = True
+
+
+class StoreField:
+    """An attribute kept in the entity's slot of the store"""
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        return entity.store.arrays[self.name][entity.slot].item()
+
+    def __set__(self, entity, value) -> None:
+        entity.store.arrays[self.name][entity.slot] = value
+
+
+class StoreTime(StoreField):
+    """A timestamp, None until it is first set"""
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        value = entity.store.arrays[self.name][entity.slot].item()
+        return None if isnan(value) else value
+
+    def __set__(self, entity, value) -> None:
+        entity.store.arrays[self.name][entity.slot] = float('nan') if value is None else value
+
+
+class StoreVector(StoreField):
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        return pygame.math.Vector2(entity.store.arrays[self.name][entity.slot].tolist())
+
+    def __set__(self, entity, value) -> None:
+        entity.store.arrays[self.name][entity.slot] = (value[0], value[1])
+
+
+class StoredEnemy(Enemy):
+    """An Enemy whose per-frame state lives in an EntityStore slot"""
+
+    direction = StoreVector()
+    speed = StoreField()
+    resistance = StoreField()
+    health = StoreField()
+    animation_start = StoreField()
+    animation_speed = StoreField()
+    can_attack = StoreField()
+    attack_time = StoreTime()
+    attack_cooldown = StoreField()
+    vulnerable = StoreField()
+    hit_time = StoreTime()
+    invincibility_duration = StoreField()
+
+    def __init__(self, store: EntityStore, *args, **kwargs) -> None:
+        # the slot has to exist before Enemy.__init__ sets the attributes
+        self.store = store
+        self.slot = store.allocate()
+        super().__init__(*args, **kwargs)
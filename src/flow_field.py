@@ -0,0 +1,124 @@
+import numpy as np
+
+from settings import *
+
+# neighbour offsets (col, row), the diagonals come last
+NEIGHBOURS = [(0, -1), (1, 0), (0, 1), (-1, 0), (1, -1), (1, 1), (-1, 1), (-1, -1)]
+LANE_TOLERANCE = TILESIZE // 16
+
+
+class FlowField:
+    """Shared path to the player for every monster.
+
+    A breadth-first search from the player's tile over a square window of
+    FLOW_FIELD_RADIUS tiles gives each free tile its step distance to the
+    player. Each tile then points at its closest neighbour, so a monster
+    only looks up the tile it stands on and heads for the centre of the
+    next one. Tiles with an obstacle hitbox (map boundaries, objects, uncut
+    grass) are walls. The field is rebuilt only when the player enters
+    another tile.
+    """
+
+    def __init__(self, obstacle_sprites, radius: int = FLOW_FIELD_RADIUS) -> None:
+        self.obstacle_sprites = obstacle_sprites
+        self.radius = radius
+        self.size = radius * 2 + 1
+
+        self.player_tile = None
+        self.origin = (0, 0)
+        self.distances = np.full((self.size, self.size), np.inf)
+        self.next_steps = np.zeros((self.size, self.size, 2), dtype=int)
+
+    def update(self, player_position) -> None:
+        tile = (int(player_position[0] // TILESIZE), int(player_position[1] // TILESIZE))
+        if tile != self.player_tile:
+            self.player_tile = tile
+            self.build(tile)
+
+    def blocked_tiles(self) -> np.ndarray:
+        """Walls of the window, indexed [row, col]"""
+        self.obstacle_sprites.flush()
+        cells = self.obstacle_sprites.spatial_hash.cells
+        left, top = self.origin
+        return np.array([
+            [(left + col, top + row) in cells for col in range(self.size)]
+            for row in range(self.size)
+        ])
+
+    def build(self, player_tile) -> None:
+        size = self.size
+        self.origin = (player_tile[0] - self.radius, player_tile[1] - self.radius)
+        blocked = self.blocked_tiles()
+
+        # breadth first over the free tiles from where the player stands, one ring of tiles per pass
+        distances = np.full((size, size), np.inf)
+        frontier = np.zeros((size, size), dtype=bool)
+        frontier[self.radius, self.radius] = True
+        open_tiles = ~blocked
+        distance = 0
+        while frontier.any():
+            distances[frontier] = distance
+            open_tiles &= ~frontier
+            grown = np.zeros_like(frontier)
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & open_tiles
+            distance += 1
+
+        # every tile points at its closest neighbour, diagonals only when both sides are free
+        padded = np.pad(distances, 1, constant_values=np.inf)
+        free = np.pad(~blocked, 1, constant_values=False)
+        neighbour_distances = []
+        for step_col, step_row in NEIGHBOURS:
+            shifted = padded[1 + step_row:1 + step_row + size, 1 + step_col:1 + step_col + size]
+            if step_col and step_row:
+                sides_free = (
+                    free[1 + step_row:1 + step_row + size, 1:1 + size] &
+                    free[1:1 + size, 1 + step_col:1 + step_col + size]
+                )
+                shifted = np.where(sides_free, shifted, np.inf)
+            neighbour_distances.append(shifted)
+        neighbour_distances = np.stack(neighbour_distances)
+
+        best = np.argmin(neighbour_distances, axis=0)
+        next_steps = np.array(NEIGHBOURS)[best]
+
+        # no way down from here (the player's tile or cut off), the monster walks straight
+        downhill = np.take_along_axis(neighbour_distances, best[None], axis=0)[0] < distances
+        next_steps[~downhill] = 0
+
+        self.distances = distances
+        self.next_steps = next_steps
+
+    def sample(self, positions: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+        """Direction for each (x, y) position, fallback where the field has none"""
+        cols = (positions[:, 0] // TILESIZE).astype(int) - self.origin[0]
+        rows = (positions[:, 1] // TILESIZE).astype(int) - self.origin[1]
+        inside = (cols >= 0) & (cols < self.size) & (rows >= 0) & (rows < self.size)
+
+        directions = fallback.copy()
+        cols, rows = cols[inside], rows[inside]
+        # a tile away from the player, heading straight at them is better than the tile centre
+        next_steps = self.next_steps[rows, cols]
+        guided = (self.distances[rows, cols] > 1) & next_steps.any(axis=1)
+
+        tiles = np.stack([cols, rows], axis=1)[guided] + self.origin
+        next_steps = next_steps[guided]
+        positions = positions[inside][guided]
+        targets = (tiles + next_steps + .5) * TILESIZE
+
+        # a straight step starts from the middle of the lane, or the hitbox catches the wall beside it
+        centres = (tiles + .5) * TILESIZE
+        for axis in (0, 1):
+            off_lane = (next_steps[:, axis] == 0) & (np.abs(positions[:, axis] - centres[:, axis]) > LANE_TOLERANCE)
+            targets[off_lane, axis] = centres[off_lane, axis]
+            targets[off_lane, 1 - axis] = positions[off_lane, 1 - axis]
+
+        deltas = targets - positions
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+        lengths[lengths == 0] = 1
+
+        directions[np.flatnonzero(inside)[guided]] = deltas / lengths[:, None]
+        return directions
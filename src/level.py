@@ -1,35 +1,64 @@
-from random import choice, randint
+from functools import partial
+from heapq import merge
+from random import Random, randint
+from typing import List
 
 import pygame
 
+from src.animation import animation_clock
+from src.assets import assets
+from src.clock import get_ticks
+from src.profiler import profiler
+from src.renderer import get_display
+from src.sounds import sounds
 from src.enemy import Enemy 
-from src.particles import AnimationPlayer
+from src.enemy_system import EnemyGroup
+from src.entity_store import EntityStore, StoredEnemy
+from src.flow_field import FlowField
+from src.particles import AnimationPlayer, ParticlePool
 from src.player.player import Player
 from src.player.magic import MagicPlayer
 from settings import *
-from src.support import import_csv_layout, import_folder_imgs
+from src.map_data import import_map_layers
+from src.support import import_folder_imgs
 from src.tile import Tile
 from src.ui import Ui
 from src.weapon import Weapon
 from src.menus.upgrade import UpgradeMenu
+from src.spatial import SpatialGroup, SpatialHash
+from src.static_layer import StaticLayer
+from src.world import ChunkedWorld
 
 
 class Level:
     def __init__(self) -> None:
         # Get display surface
-        self.display_surface = pygame.display.get_surface()
+        self.display_surface = get_display()
         self.game_paused = False
+        self.paused_frame = None
+        self.music = 'forest'
+
+        # what changed on screen this frame, None means all of it
+        self.dirty_rects = None
+        self.full_update = True
 
         # Sprite groups setup
         self.visible_sprites = YSortCameraGroup()
-        self.obstacle_sprites = pygame.sprite.Group()
+        # obstacles are indexed by hitbox, killed grass leaves the index with the group
+        self.obstacle_sprites = SpatialGroup(rect_attr='hitbox')
+        self.enemy_sprites = EnemyGroup(
+            store=EntityStore() if ENTITY_STORE else None,
+            flow_field=FlowField(self.obstacle_sprites)
+        )
     
         # Attack sprites
         self.current_attack = None
         self.attack_sprites = pygame.sprite.Group()
-        self.attackable_sprites = pygame.sprite.Group()
+        # indexed by rect like spritecollide, monsters are moved in the index as they walk
+        self.attackable_sprites = SpatialGroup(rect_attr='rect')
 
         # Sprite setup
+        self.world = None
         self.create_world()
 
         # User Interface
@@ -41,71 +70,87 @@ class Level:
         self.magic_player = MagicPlayer(self.animation_player)
 
     def create_world(self) -> None:
+        map_layers = import_map_layers()
         layouts = {
-            'boundary': import_csv_layout('./map/map_FloorBlocks.csv'),
-            'grass': import_csv_layout('./map/map_Grass.csv'),
-            'object': import_csv_layout('./map/map_Objects.csv'),
-            'entities': import_csv_layout('./map/map_Entities.csv')
+            'boundary': map_layers['FloorBlocks'],
+            'grass': map_layers['Grass'],
+            'object': map_layers['Objects'],
+            'entities': map_layers['Entities']
         }
-        graphics = {
+        self.graphics = {
             'grass': import_folder_imgs('./graphics/grass'),
             'objects': import_folder_imgs('./graphics/objects')
         }
 
-        for style, layout in layouts.items():
-            for row_index, row in enumerate(layout):
-                for col_index, col in enumerate(row):
-                    if col != '-1':
-                        x = col_index * TILESIZE
-                        y = row_index * TILESIZE
-
-                        if style == 'boundary':
-                            Tile(
-                                pos=(x,y),
-                                groups=[self.obstacle_sprites],
-                                sprite_type='invisible',
-                            )
-                        if style == 'grass':
-                            random_grass_image = choice(graphics['grass'])
-                            Tile(
-                                pos=(x,y),
-                                groups=[self.visible_sprites, self.obstacle_sprites, self.attackable_sprites],
-                                sprite_type='grass',
-                                surface=random_grass_image
-                            )
-                        if style == 'object':
-                            surface = graphics['objects'][int(col)]
-                            Tile(
-                                pos=(x,y),
-                                groups=[self.visible_sprites, self.obstacle_sprites],
-                                sprite_type='object',
-                                surface=surface
-                            )
-                        if style == 'entities':
-                            if col == '394':
-                                self.player = Player(
-                                    pos=(x,y),
-                                    groups=[self.visible_sprites],
-                                    obstacle_sprites=self.obstacle_sprites,
-                                    create_attack=self.create_attack,
-                                    destroy_attack=self.destroy_attack,
-                                    create_magic=self.create_magic
-                                )
-                            else:
-                                if col == '390': monster_name = 'bamboo'
-                                elif col == '391': monster_name = 'spirit'
-                                elif col == '392': monster_name = 'raccoon'
-                                else: monster_name = 'squid'
-
-                                self.enemy = Enemy(
-                                    monster_name=monster_name,
-                                    position=(x, y),
-                                    groups=[self.visible_sprites, self.attackable_sprites],
-                                    obstacle_sprites=self.obstacle_sprites,
-                                    damage_player=self.damage_player,
-                                    trigger_death_particles=self.trigger_death_particles,
-                                    add_xp = self.add_xp
-                                )
+        for col_index, row_index, col in layouts['entities'].non_empty():
+            if col == PLAYER_ENTITY_ID:
+                self.player = Player(
+                    pos=(col_index * TILESIZE, row_index * TILESIZE),
+                    groups=[self.visible_sprites],
+                    obstacle_sprites=self.obstacle_sprites,
+                    create_attack=self.create_attack,
+                    destroy_attack=self.destroy_attack,
+                    create_magic=self.create_magic
+                )
+                # sounds of the world are heard from where the player stands
+                sounds.listener = self.player
+
+        # tiles and monsters only exist around the player, see ChunkedWorld
+        self.world = ChunkedWorld(
+            layouts=layouts,
+            create_tile=self.create_tile,
+            create_enemy=self.create_enemy,
+            enemy_sprites=self.enemy_sprites,
+            static_layer=self.visible_sprites.static_layer
+        )
+        self.world.update(self.player.rect.center)
+
+        # index every obstacle now instead of on the first collision
+        self.obstacle_sprites.flush()
+
+    def create_tile(self, style, col_index, row_index, col) -> Tile:
+        x = col_index * TILESIZE
+        y = row_index * TILESIZE
+
+        if style == 'boundary':
+            return Tile(
+                pos=(x,y),
+                groups=[self.obstacle_sprites],
+                sprite_type='invisible',
+            )
+        if style == 'grass':
+            # picked from the position so the grass looks the same every time the chunk loads
+            grass_image = Random(col_index * 65536 + row_index).choice(self.graphics['grass'])
+            return Tile(
+                pos=(x,y),
+                groups=[self.visible_sprites, self.obstacle_sprites, self.attackable_sprites],
+                sprite_type='grass',
+                surface=grass_image
+            )
+        if style == 'object':
+            surface = self.graphics['objects'][col]
+            return Tile(
+                pos=(x,y),
+                groups=[self.visible_sprites, self.obstacle_sprites],
+                sprite_type='object',
+                surface=surface
+            )
+
+    def create_enemy(self, monster_name, position, health = None) -> Enemy:
+        store = self.enemy_sprites.store
+        enemy_class = partial(StoredEnemy, store) if store is not None else Enemy
+        enemy = enemy_class(
+            monster_name=monster_name,
+            position=position,
+            groups=[self.visible_sprites, self.attackable_sprites, self.enemy_sprites],
+            obstacle_sprites=self.obstacle_sprites,
+            damage_player=self.damage_player,
+            trigger_death_particles=self.trigger_death_particles,
+            add_xp = self.add_xp
+        )
+        if health is not None:
+            enemy.health = health
+        return enemy
 
     def create_attack(self):
         self.current_attack = Weapon(self.player, [self.visible_sprites, self.attack_sprites])
@@ -116,27 +161,30 @@ class Level:
         self.current_attack = None
 
     def player_attack_logic(self):
-        if self.attack_sprites:
-            for attack_sprite in self.attack_sprites:
-                collision_sprites = pygame.sprite.spritecollide(
-                    sprite=attack_sprite,
-                    group=self.attackable_sprites,
-                    dokill=False
+        if not self.attack_sprites:
+            return
+
+        # gather the hits of every attack first, a target hit twice in a frame counts once
+        cut_grass = {}
+        damaged_enemies = {}
+        for attack_sprite in self.attack_sprites:
+            for target_sprite in self.attackable_sprites.collide(attack_sprite.rect):
+                if target_sprite.sprite_type == 'grass':
+                    cut_grass[target_sprite] = None
+                else:
+                    damaged_enemies.setdefault(target_sprite, attack_sprite.sprite_type)
+
+        offset = pygame.math.Vector2(0 ,75)
+        for target_sprite in cut_grass:
+            position = target_sprite.rect.center
+            for _ in range(randint(3, 6)):
+                self.animation_player.create_grass_particles(
+                    position=position - offset, groups=[self.visible_sprites]
                 )
+            target_sprite.kill()
 
-                if collision_sprites:
-                    for target_sprite in collision_sprites:
-                        if target_sprite.sprite_type == 'grass':
-                            position = target_sprite.rect.center
-                            offset = pygame.math.Vector2(0 ,75)
-
-                            for _ in range(randint(3, 6)):
-                                self.animation_player.create_grass_particles(
-                                    position=position - offset, groups=[self.visible_sprites]
-                                )
-                            target_sprite.kill()
-                        else:
-                            target_sprite.get_damage(self.player, attack_sprite.sprite_type)
+        for target_sprite, attack_type in damaged_enemies.items():
+            target_sprite.get_damage(self.player, attack_type)
 
     def create_magic(self, style, strength, cost):
         if style == 'heal':
@@ -158,7 +206,7 @@ class Level:
         if self.player.vulnerable:
             self.player.health -= amount
             self.player.vulnerable = False
-            self.player.hurt_time = pygame.time.get_ticks()
+            self.player.hurt_time = get_ticks()
             self.animation_player.create_particles(
                 animation_type=attack_type,
                 position=self.player.rect.center,
@@ -177,53 +225,184 @@ class Level:
 
     def toggle_menu(self):
         self.game_paused = not self.game_paused
+        self.paused_frame = None
+        self.full_update = True
 
     def run(self) -> None:
         """Update and draw the game"""
-        self.visible_sprites.custom_draw(self.player)
-        self.ui.display(self.player)
+        if self.paused_frame is not None:
+            # nothing moves behind the menu, show the world as it was when it opened
+            self.display_surface.blit(self.paused_frame, (0, 0))
+            world_rects = []
+        else:
+            with profiler.section('custom_draw'):
+                self.visible_sprites.custom_draw(self.player)
+            world_rects = self.visible_sprites.dirty_rects
+
+            if self.game_paused:
+                self.paused_frame = self.display_surface.copy()
+
+        with profiler.section('ui.display'):
+            self.ui.display(self.player)
 
         if self.game_paused:
-            self.upgrade_menu.display()
+            with profiler.section('upgrade_menu.display'):
+                self.upgrade_menu.display()
             # display upgrade menu
         else:
             # run the game
-            self.visible_sprites.update()
-            self.visible_sprites.enemy_update(self.player)
-            self.player_attack_logic()
+            animation_clock.advance()
+            if self.world:
+                with profiler.section('world.update'):
+                    self.world.update(self.player.rect.center)
+            with profiler.section('visible_sprites.update'):
+                # monsters far from the player sleep, EnemyGroup decides which ones update
+                self.visible_sprites.update(skip=self.enemy_sprites)
+                self.enemy_sprites.update()
+                self.attackable_sprites.relocate_all(self.enemy_sprites.awake_enemies)
+                self.attackable_sprites.relocate_all(self.enemy_sprites.animated_enemies)
+            with profiler.section('enemy_update'):
+                self.enemy_sprites.enemy_update(self.player)
+            with profiler.section('player_attack_logic'):
+                self.player_attack_logic()
+
+        if world_rects is None or self.full_update:
+            self.dirty_rects = None
+        else:
+            self.dirty_rects = world_rects + self.ui.dirty_rects
+            if self.game_paused:
+                self.dirty_rects += self.upgrade_menu.dirty_rects
+        self.full_update = False
 
 
 class YSortCameraGroup(pygame.sprite.Group):
     def __init__(self, *sprites) -> None:
+        # sprite indexes, sprites get sorted in on the next draw
+        self.static_sprites = SpatialHash(cell_size=TILESIZE * 4, rect_attr='rect')
+        self.dynamic_sprites = []
+        self.pending_sprites = {}
+        # tiles have nothing to update, the rest in the order they were added
+        self.updated_sprites = {}
+        self.particles = ParticlePool()
+
+        # screen areas that changed since the last frame, None when the camera moved
+        self.dirty_rects = None
+        self.last_camera_position = None
+        self.last_drawn_rects = []
+        self.killed_tile_rects = []
+
+        # creating floor, tiles are baked on top of it in chunks
+        self.floor_surface = assets.image('./graphics/tilemap/ground.png')
+        self.static_layer = StaticLayer(self.floor_surface)
+
         # general setup
         super().__init__(*sprites)
-        self.display_surface = pygame.display.get_surface()
+        self.display_surface = get_display()
         self.half_width = self.display_surface.get_size()[0] // 2
         self.half_height = self.display_surface.get_size()[1] // 2
         self.offset = pygame.math.Vector2()
+        self.camera_rect = self.display_surface.get_rect()
+
+    def add_internal(self, sprite, layer=None) -> None:
+        super().add_internal(sprite, layer)
+        self.pending_sprites[sprite] = None
+        if not isinstance(sprite, Tile):
+            self.updated_sprites[sprite] = None
+
+    def remove_internal(self, sprite) -> None:
+        super().remove_internal(sprite)
+        self.updated_sprites.pop(sprite, None)
+        if self.pending_sprites.pop(sprite, 0) is None:
+            return
+
+        if sprite in self.static_sprites:
+            self.static_sprites.remove(sprite)
+            self.static_layer.remove(sprite)
+            self.killed_tile_rects.append(sprite.rect.copy())
+        else:
+            self.dynamic_sprites.remove(sprite)
+
+    def sort_pending_sprites(self) -> None:
+        """Tiles never move and go to the static layer, everything else is re-sorted each frame"""
+        for sprite in self.pending_sprites:
+            if isinstance(sprite, Tile):
+                self.static_sprites.insert(sprite)
+                self.static_layer.add(sprite)
+            else:
+                self.dynamic_sprites.append(sprite)
+        self.pending_sprites.clear()
+
+    def get_visible_dynamic_sprites(self) -> List:
+        # entities barely change order between frames, timsort keeps this close to linear
+        self.dynamic_sprites.sort(key=lambda sprite: sprite.rect.centery)
+
+        camera_rect = self.camera_rect
+        return [
+            sprite for sprite in self.dynamic_sprites
+            if camera_rect.colliderect(sprite.rect)
+        ]
+
+    def get_occluding_static_sprites(self, dynamic_sprites: List) -> List:
+        """Tiles already baked in the static layer that must be drawn again over a moving sprite"""
+        occluders = {}
+        stack = [sprite for sprite in dynamic_sprites]
+
+        # a tile lower on the screen covers the sprite, and whatever tile covers that tile too
+        while stack:
+            sprite = stack.pop()
+            for tile in self.static_sprites.query(sprite.rect):
+                if tile not in occluders and tile.rect.centery > sprite.rect.centery and tile.rect.colliderect(sprite.rect):
+                    occluders[tile] = None
+                    stack.append(tile)
 
-        # creating floor
-        self.floor_surface = pygame.image.load('./graphics/tilemap/ground.png')
-        self.floor_rect = self.floor_surface.get_rect(topleft = (0,0))
+        return sorted(occluders, key=lambda sprite: sprite.rect.centery)
 
     def custom_draw(self, player) -> None:
         # getting offset
         self.offset.x = player.rect.centerx - self.half_width
         self.offset.y = player.rect.centery - self.half_height
+        self.camera_rect.topleft = self.offset
 
-        # drawing the floor
-        floor_offset_position = self.floor_rect.topleft - self.offset
-        self.display_surface.blit(self.floor_surface, floor_offset_position)
+        if self.pending_sprites:
+            self.sort_pending_sprites()
 
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_position = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_position)
+        # drawing the floor and the tiles
+        self.static_layer.draw(self.display_surface, self.camera_rect)
 
-    def enemy_update(self, player) -> None:
-        enemy_sprites = [
-            sprite\
-            for sprite in self.sprites()\
-            if hasattr(sprite, 'sprite_type') and sprite.sprite_type == 'enemy'
-        ]
-        for enemy in enemy_sprites:
-            enemy.enemy_update(player)
\ No newline at end of file
+        dynamic_sprites = self.get_visible_dynamic_sprites()
+        visible_sprites = merge(
+            self.get_occluding_static_sprites(dynamic_sprites),
+            dynamic_sprites,
+            key=lambda sprite: sprite.rect.centery
+        )
+        # a single call into pygame for the whole visible set
+        offset_x, offset_y = self.camera_rect.topleft
+        drawn_rects = self.display_surface.blits([
+            (sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+            for sprite in visible_sprites
+        ])
+
+        # particles are drawn in one batch over the sorted sprites
+        drawn_rects += self.particles.draw(self.display_surface, self.camera_rect)
+        self.update_dirty_rects(drawn_rects)
+
+    def update_dirty_rects(self, drawn_rects: List) -> None:
+        # what moved is where it was drawn last frame plus where it is now
+        camera_position = self.camera_rect.topleft
+        if camera_position != self.last_camera_position:
+            self.dirty_rects = None
+        else:
+            self.dirty_rects = self.last_drawn_rects + drawn_rects + [
+                rect.move(-camera_position[0], -camera_position[1]) for rect in self.killed_tile_rects
+            ]
+
+        self.last_camera_position = camera_position
+        self.last_drawn_rects = drawn_rects
+        self.killed_tile_rects.clear()
+
+    def update(self, skip = ()) -> None:
+        """Update every sprite except the tiles and the ones in skip, which are updated elsewhere"""
+        for sprite in list(self.updated_sprites):
+            if sprite not in skip:
+                sprite.update()
+        self.particles.update()
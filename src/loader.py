@@ -0,0 +1,158 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from os import walk
+from os.path import normpath
+from typing import Callable, List, Set
+
+import pygame
+
+from settings import *
+from src.assets import assets, sort_img_files
+from src.atlas import find_frame_folders
+from src.map_data import import_map_layers
+
+# frame groups every level needs, monsters are picked by where they stand
+LEVEL_FRAME_GROUPS = ['grass', 'objects', 'player', 'particles']
+LEVEL_IMAGES = [
+    './graphics/tilemap/ground.png',
+    './graphics/player/player.png'
+] + [weapon['graphic'] for weapon in WEAPON_DATA.values()] + [magic['graphic'] for magic in MAGIC_DATA.values()]
+
+
+class AssetLoader:
+    """Decodes the level's image files and sounds on a pool of worker threads.
+
+    The workers only read and decode files, the main thread keeps drawing
+    the loading screen and converts each finished image to the display
+    format (convert_alpha needs the display). What the level needs around
+    the player is queued first; the level can start once that is in, the
+    rest is finished between frames and handed to the AssetCache.
+    """
+
+    def __init__(self, workers: int = LOADER_WORKERS) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+        self.queued: Set[str] = set()
+        # (futures, finish, essential), finish runs on the main thread once every future is done
+        self.jobs = []
+        self.total = 0
+        self.finished = 0
+        self.essential_left = 0
+
+    @property
+    def progress(self) -> float:
+        return self.finished / self.total if self.total else 1
+
+    @property
+    def ready(self) -> bool:
+        """Everything the level needs to start is loaded"""
+        return self.essential_left == 0
+
+    @property
+    def done(self) -> bool:
+        return not self.jobs
+
+    def decode(self, path: str, load: Callable) -> Future:
+        path = normpath(path)
+        future = self.executor.submit(load, path)
+        assets.prefetch(path, future)
+        self.queued.add(path)
+        return future
+
+    def add_job(self, futures: List[Future], finish: Callable, essential: bool) -> None:
+        self.jobs.append((futures, finish, essential))
+        self.total += 1
+        if essential:
+            self.essential_left += 1
+
+    def image(self, path: str, essential: bool = True) -> None:
+        if normpath(path) not in self.queued:
+            self.add_job([self.decode(path, pygame.image.load)], lambda: assets.image(path), essential)
+
+    def frames(self, folder: str, essential: bool = True) -> None:
+        atlas = assets.get_atlas_index().get(normpath(folder))
+        if atlas:
+            # every folder of a sheet comes with it
+            self.image(atlas[0], essential)
+            return
+        if normpath(folder) in self.queued:
+            return
+        self.queued.add(normpath(folder))
+
+        futures = [
+            self.decode(folder + '/' + img, pygame.image.load)
+            for _, _, img_files in walk(folder)
+            for img in sort_img_files(folder, img_files)
+        ]
+        self.add_job(futures, lambda: assets.frames(folder), essential)
+
+    def sound(self, path: str, essential: bool = False) -> None:
+        if pygame.mixer.get_init() and normpath(path) not in self.queued:
+            self.add_job([self.decode(path, pygame.mixer.Sound)], lambda: assets.sound(path), essential)
+
+    def queue_level(self) -> None:
+        """Queue every asset of the level, the player's surroundings first"""
+        nearby = nearby_monsters()
+        for path in LEVEL_IMAGES:
+            self.image(path)
+        for group in LEVEL_FRAME_GROUPS:
+            for folder in find_frame_folders(ATLAS_GROUPS[group]):
+                self.frames(folder)
+        for monster_name in sorted(nearby):
+            self.queue_monster(monster_name, essential=True)
+
+        # needed later on: monsters further away, weapons in hand and sounds
+        for monster_name in sorted(set(ENEMY_MONSTERS_DATA) - nearby):
+            self.queue_monster(monster_name, essential=False)
+        for weapon in WEAPON_DATA:
+            for direction in ('up', 'down', 'left', 'right'):
+                self.image(f'./graphics/weapons/{weapon}/{direction}.png', essential=False)
+        for effect in SOUND_EFFECTS.values():
+            self.sound(effect['path'])
+
+    def queue_monster(self, monster_name: str, essential: bool) -> None:
+        for folder in find_frame_folders(f'./graphics/monsters/{monster_name}'):
+            self.frames(folder, essential)
+
+    def poll(self) -> None:
+        """Convert what the workers finished, call it once per frame"""
+        pending = []
+        for futures, finish, essential in self.jobs:
+            if all(future.done() for future in futures):
+                finish()
+                self.finished += 1
+                if essential:
+                    self.essential_left -= 1
+            else:
+                pending.append((futures, finish, essential))
+        self.jobs = pending
+
+        if self.done:
+            self.executor.shutdown(wait=False)
+
+    def wait(self, timeout: float = None) -> None:
+        """Sleep until a worker finishes something or the timeout runs out"""
+        pending = [future for futures, _, _ in self.jobs for future in futures if not future.done()]
+        if pending:
+            wait(pending, timeout, return_when=FIRST_COMPLETED)
+
+    def wait_ready(self) -> None:
+        """Block until the level can start, for runs without a loading screen"""
+        while not self.ready:
+            self.wait()
+            self.poll()
+
+
+def nearby_monsters() -> Set[str]:
+    """Monsters standing in the chunks loaded around the player at the start"""
+    entities = import_map_layers()['Entities']
+    player_cell = next(
+        ((col, row) for col, row, value in entities.non_empty() if value == PLAYER_ENTITY_ID), (0, 0)
+    )
+
+    chunk_col, chunk_row = player_cell[0] // WORLD_CHUNK_SIZE, player_cell[1] // WORLD_CHUNK_SIZE
+    size = (WORLD_LOAD_RADIUS * 2 + 1) * WORLD_CHUNK_SIZE
+    region = entities.region(
+        (chunk_col - WORLD_LOAD_RADIUS) * WORLD_CHUNK_SIZE,
+        (chunk_row - WORLD_LOAD_RADIUS) * WORLD_CHUNK_SIZE,
+        size, size
+    )
+    return {ENTITY_MONSTERS.get(value, 'squid') for _, _, value in region if value != PLAYER_ENTITY_ID}
@@ -0,0 +1,151 @@
+# Compiles the map/*.csv layers into one binary file, run `make map` after
+# editing the map
+import mmap
+import struct
+import sys
+from array import array
+from glob import glob
+from os.path import basename, exists, getmtime, splitext
+from typing import Dict, List
+
+from settings import *
+from src.support import import_csv_layout
+
+MAGIC = b'ADEM'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+LAYER_HEADER = struct.Struct('<HHI')
+
+
+class MapLayer:
+    """A map layer as a flat int16 array plus the indexes of its non-empty cells"""
+
+    def __init__(self, width: int, height: int, cells, filled) -> None:
+        self.width = width
+        self.height = height
+        self.cells = cells
+        self.filled = filled
+
+    @classmethod
+    def from_rows(cls, rows: List[List]) -> 'MapLayer':
+        height = len(rows)
+        width = len(rows[0]) if rows else 0
+        cells = array('h', (int(value) for row in rows for value in row))
+        filled = array('i', (index for index, value in enumerate(cells) if value != -1))
+        return cls(width, height, cells, filled)
+
+    def __getitem__(self, position):
+        col, row = position
+        return self.cells[row * self.width + col]
+
+    def non_empty(self):
+        """(col, row, value) of every non-empty cell, in row order"""
+        width = self.width
+        cells = self.cells
+        for index in self.filled:
+            row, col = divmod(index, width)
+            yield col, row, cells[index]
+
+    def region(self, left: int, top: int, cols: int, rows: int):
+        """(col, row, value) of the non-empty cells inside a block of the layer, in row order"""
+        right, bottom = min(left + cols, self.width), min(top + rows, self.height)
+        left, top = max(left, 0), max(top, 0)
+        cells = self.cells
+        for row in range(top, bottom):
+            start = row * self.width
+            for col, value in enumerate(cells[start + left:start + right], left):
+                if value != -1:
+                    yield col, row, value
+
+
+def layer_name(csv_path: str) -> str:
+    # map/map_FloorBlocks.csv -> FloorBlocks
+    return splitext(basename(csv_path))[0].split('_', 1)[-1]
+
+
+def padding(offset: int) -> int:
+    # keeps the arrays 4-byte aligned so they can be cast in place
+    return -offset % 4
+
+
+def little_endian(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def compile_map(csv_paths: List[str], output_path: str = MAP_BINARY_PATH) -> Dict[str, MapLayer]:
+    layers = {layer_name(path): MapLayer.from_rows(import_csv_layout(path)) for path in csv_paths}
+
+    with open(output_path, 'wb') as map_file:
+        map_file.write(HEADER.pack(MAGIC, VERSION, len(layers)))
+        for name, layer in layers.items():
+            encoded_name = name.encode()
+            map_file.write(struct.pack('<B', len(encoded_name)) + encoded_name)
+            map_file.write(bytes(padding(map_file.tell())))
+            map_file.write(LAYER_HEADER.pack(layer.width, layer.height, len(layer.filled)))
+            map_file.write(little_endian(layer.cells))
+            map_file.write(bytes(padding(map_file.tell())))
+            map_file.write(little_endian(layer.filled))
+
+    return layers
+
+
+def read_array(buffer, offset: int, typecode: str, count: int, use_mmap: bool):
+    size = array(typecode).itemsize * count
+    data = memoryview(buffer)[offset:offset + size]
+
+    if use_mmap and sys.byteorder == 'little':
+        # a view straight into the mapped file, nothing is copied
+        return data.cast(typecode), offset + size
+
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values, offset + size
+
+
+def load_map(path: str = MAP_BINARY_PATH, use_mmap: bool = False) -> Dict[str, MapLayer]:
+    with open(path, 'rb') as map_file:
+        if use_mmap:
+            buffer = mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = map_file.read()
+
+    magic, version, layer_count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is not a compiled map (version {VERSION})')
+
+    layers = {}
+    offset = HEADER.size
+    for _ in range(layer_count):
+        name_length = buffer[offset]
+        name = bytes(buffer[offset + 1:offset + 1 + name_length]).decode()
+        offset += 1 + name_length
+        offset += padding(offset)
+
+        width, height, filled_count = LAYER_HEADER.unpack_from(buffer, offset)
+        offset += LAYER_HEADER.size
+        cells, offset = read_array(buffer, offset, 'h', width * height, use_mmap)
+        offset += padding(offset)
+        filled, offset = read_array(buffer, offset, 'i', filled_count, use_mmap)
+        layers[name] = MapLayer(width, height, cells, filled)
+
+    return layers
+
+
+def import_map_layers(csv_folder: str = MAP_CSV_FOLDER, path: str = MAP_BINARY_PATH) -> Dict[str, MapLayer]:
+    """Compiled layers when the binary is up to date, otherwise parse the csv files"""
+    csv_paths = sorted(glob(csv_folder + '/*.csv'))
+
+    if exists(path) and all(getmtime(path) >= getmtime(csv_path) for csv_path in csv_paths):
+        return load_map(path, use_mmap=MAP_USE_MMAP)
+
+    return {layer_name(csv_path): MapLayer.from_rows(import_csv_layout(csv_path)) for csv_path in csv_paths}
+
+
+if __name__ == '__main__':
+    for name, layer in compile_map(sorted(glob(MAP_CSV_FOLDER + '/*.csv'))).items():
+        print(f'{name}: {layer.width}x{layer.height}, {len(layer.filled)} tiles')
@@ -0,0 +1,30 @@
+import pygame
+
+from settings import *
+from src.renderer import get_display
+
+
+class LoadingScreen:
+    """Progress bar shown while the AssetLoader works"""
+
+    def __init__(self) -> None:
+        self.display_surface = get_display()
+        self.font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
+        self.text = self.font.render('Loading', False, TEXT_COLOR)
+
+    def draw(self, progress: float) -> None:
+        # drawn on its own surface, the sdl2 renderer can only blit
+        bar_rect = pygame.Rect(0, 0, LOADING_BAR_WIDTH, BAR_HEIGHT)
+        surface = pygame.Surface((LOADING_BAR_WIDTH, BAR_HEIGHT + self.text.get_height() + 10)).convert()
+        surface.fill(WATER_COLOR)
+        surface.blit(self.text, self.text.get_rect(midtop = (LOADING_BAR_WIDTH // 2, 0)))
+
+        bar_rect.bottom = surface.get_height()
+        pygame.draw.rect(surface, UI_BG_COLOR, bar_rect)
+        filled_rect = bar_rect.copy()
+        filled_rect.width = bar_rect.width * progress
+        pygame.draw.rect(surface, HEALTH_COLOR, filled_rect)
+        pygame.draw.rect(surface, UI_BORDER_COLOR, bar_rect, 3)
+
+        self.display_surface.fill(WATER_COLOR)
+        self.display_surface.blit(surface, surface.get_rect(center = self.display_surface.get_rect().center))
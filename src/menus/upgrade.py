@@ -1,14 +1,17 @@
 import pygame
 
 from settings import *
+from src.clock import get_ticks
+from src.controls import get_pressed
 from src.player.player import Player
+from src.renderer import get_display
 
 
 class UpgradeMenu:
     def __init__(self, player: Player) -> None:
         
         # General setup
-        self.display_surface = pygame.display.get_surface()
+        self.display_surface = get_display()
         self.player = player
         self.attribute_number = len(player.stats)
         self.attribute_names = list(player.stats.keys())
@@ -24,28 +27,29 @@ class UpgradeMenu:
         self.selection_index = 0
         self.selection_time = None
         self.can_move = True
+        self.dirty_rects = []
     
     def key_input(self):
-        keys = pygame.key.get_pressed()
+        keys = get_pressed()
 
         if self.can_move:
             if keys[pygame.K_RIGHT] and self.selection_index < self.attribute_number - 1:
                 self.selection_index += 1
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = get_ticks()
             elif keys[pygame.K_LEFT] and self.selection_index >= 1:
                 self.selection_index -= 1
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = get_ticks()
 
             if keys[pygame.K_SPACE]:
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = get_ticks()
                 self.item_list[self.selection_index].trigger(self.player)
 
     def selection_cooldown(self):
         if not self.can_move:
-            current_time = pygame.time.get_ticks()
+            current_time = get_ticks()
             if current_time - self.selection_time >= 300:
                 self.can_move = True
 
@@ -69,6 +73,8 @@ class UpgradeMenu:
         self.key_input()
         self.selection_cooldown()
 
+        cards = []
+        self.dirty_rects = []
         for index, item in enumerate(self.item_list):
             # Get Attributes
             name = self.attribute_names[index]
@@ -76,10 +82,12 @@ class UpgradeMenu:
             max_value = self.max_values[index]
             cost = self.player.get_cost_by_index(index)
 
-            item.display(
-                self.display_surface, self.selection_index, name, value, max_value, cost
-            )
+            card_state = item.card_state
+            cards.append(item.display(self.selection_index, name, value, max_value, cost))
+            if item.card_state != card_state:
+                self.dirty_rects.append(item.rect)
 
+        self.display_surface.blits(cards, doreturn=False)
 
 
 class Item:
@@ -88,26 +96,30 @@ class Item:
         self.index = index
         self.font = font
 
-    def display_names(self, surface, name, cost, selected):
+        # the card is rendered once per (name, value, cost, selected)
+        self.card_state = None
+        self.card_surface = None
+
+    def display_names(self, surface, rect, name, cost, selected):
         # color
         color = TEXT_COLOR_SELECTED if selected else TEXT_COLOR
 
         # title
         title_surface = self.font.render(name, False, color) # text, antialias, color
-        title_rect = title_surface.get_rect(midtop = self.rect.midtop + pygame.math.Vector2(0, 20))
+        title_rect = title_surface.get_rect(midtop = rect.midtop + pygame.math.Vector2(0, 20))
 
         # cost
         cost_surface = self.font.render(f'{int(cost)}', False, color)
-        cost_rect = cost_surface.get_rect(midbottom = self.rect.midbottom - pygame.math.Vector2(0, 20))
+        cost_rect = cost_surface.get_rect(midbottom = rect.midbottom - pygame.math.Vector2(0, 20))
 
         # draw
         surface.blit(title_surface, title_rect)
         surface.blit(cost_surface, cost_rect)
     
-    def display_bar(self, surface, value, max_value, selected):
+    def display_bar(self, surface, rect, value, max_value, selected):
         # Drawing setup
-        top = self.rect.midtop + pygame.math.Vector2(0, 60)
-        bottom = self.rect.midbottom - pygame.math.Vector2(0, 60)
+        top = rect.midtop + pygame.math.Vector2(0, 60)
+        bottom = rect.midbottom - pygame.math.Vector2(0, 60)
         color = BAR_COLOR_SELECTED if selected else BAR_COLOR
 
         # Bar setup
@@ -130,13 +142,28 @@ class Item:
         if player.stats[upgrade_attribute] > player.max_stats[upgrade_attribute]:
             player.stats[upgrade_attribute] = player.max_stats[upgrade_attribute]
 
-    def display(self, surface, selection_number, name, value, max_value, cost):
-        if self.index == selection_number:
-            pygame.draw.rect(surface, UPGRADE_BG_COLOR_SELECTED, self.rect)
-            pygame.draw.rect(surface, UI_BORDER_COLOR, self.rect, 4)
+    def render_card(self, name, value, max_value, cost, selected) -> pygame.Surface:
+        surface = pygame.Surface(self.rect.size).convert()
+        rect = surface.get_rect()
+
+        if selected:
+            pygame.draw.rect(surface, UPGRADE_BG_COLOR_SELECTED, rect)
+            pygame.draw.rect(surface, UI_BORDER_COLOR, rect, 4)
         else:
-            pygame.draw.rect(surface, UI_BG_COLOR, self.rect)
-            pygame.draw.rect(surface, UI_BORDER_COLOR, self.rect, 4)
+            pygame.draw.rect(surface, UI_BG_COLOR, rect)
+            pygame.draw.rect(surface, UI_BORDER_COLOR, rect, 4)
+
+        self.display_names(surface, rect, name, cost, selected)
+        self.display_bar(surface, rect, value, max_value, selected)
+        return surface
+
+    def display(self, selection_number, name, value, max_value, cost):
+        """The card and where it goes, for the menu to blit"""
+        selected = self.index == selection_number
+        state = (name, value, max_value, cost, selected)
+
+        if state != self.card_state:
+            self.card_surface = self.render_card(name, value, max_value, cost, selected)
+            self.card_state = state
 
-        self.display_names(surface, name, cost, self.index == selection_number)
-        self.display_bar(surface, value, max_value, self.index == selection_number)
\ No newline at end of file
+        return self.card_surface, self.rect
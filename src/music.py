@@ -0,0 +1,62 @@
+import pygame
+
+from settings import *
+
+
+class MusicManager:
+    """Background music streamed from disk by pygame.mixer.music.
+
+    Only a small buffer of the track is decoded at a time, instead of the
+    whole file into a Sound. Switching tracks fades the current one out and
+    the next one in. With start deferred, nothing is opened until start()
+    is called, after the first frame is on screen.
+    """
+
+    def __init__(self, volume: float = MUSIC_VOLUME, fade_ms: int = MUSIC_FADE_MS) -> None:
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.started = False
+        self.track = None
+        self.next_track = None
+
+    def start(self) -> None:
+        if self.started:
+            return
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self.started = True
+        self.update()
+
+    def play(self, name: str) -> None:
+        """Switch to a track of MUSIC_TRACKS, the current one fades out first"""
+        if name == (self.next_track or self.track):
+            return
+        self.next_track = name
+        if self.started and self.track is not None:
+            pygame.mixer.music.fadeout(self.fade_ms)
+        self.update()
+
+    def stop(self) -> None:
+        self.next_track = None
+        if self.started and self.track is not None:
+            pygame.mixer.music.fadeout(self.fade_ms)
+        self.track = None
+
+    def set_volume(self, volume: float) -> None:
+        self.volume = volume
+        if self.started:
+            pygame.mixer.music.set_volume(volume)
+
+    def update(self) -> None:
+        # the next track starts once the fade out of the last one is over
+        if not self.started or self.next_track is None or pygame.mixer.music.get_busy():
+            return
+
+        pygame.mixer.music.load(MUSIC_TRACKS[self.next_track])
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops=-1, fade_ms=self.fade_ms)
+        self.track = self.next_track
+        self.next_track = None
+
+
+music = MusicManager()
@@ -1,9 +1,13 @@
 from typing import List
 from random import choice
 
+import numpy as np
 import pygame
 from pygame.sprite  import AbstractGroup
 
+from settings import *
+from src.animation import animation_clock
+from src.assets import assets
 from src.support import import_folder_imgs
 
 
@@ -36,15 +40,21 @@ class AnimationPlayer:
                 import_folder_imgs('./graphics/particles/leaf4'),
                 import_folder_imgs('./graphics/particles/leaf5'),
                 import_folder_imgs('./graphics/particles/leaf6'),
-                self.reflect_images(import_folder_imgs('./graphics/particles/leaf1')),
-                self.reflect_images(import_folder_imgs('./graphics/particles/leaf2')),
-                self.reflect_images(import_folder_imgs('./graphics/particles/leaf3')),
-                self.reflect_images(import_folder_imgs('./graphics/particles/leaf4')),
-                self.reflect_images(import_folder_imgs('./graphics/particles/leaf5')),
-                self.reflect_images(import_folder_imgs('./graphics/particles/leaf6'))
+                self.import_reflected_imgs('./graphics/particles/leaf1'),
+                self.import_reflected_imgs('./graphics/particles/leaf2'),
+                self.import_reflected_imgs('./graphics/particles/leaf3'),
+                self.import_reflected_imgs('./graphics/particles/leaf4'),
+                self.import_reflected_imgs('./graphics/particles/leaf5'),
+                self.import_reflected_imgs('./graphics/particles/leaf6')
             )
         }
 
+    def import_reflected_imgs(self, path: str) -> List:
+        return assets.get(
+            ('reflected', path),
+            lambda: self.reflect_images(import_folder_imgs(path))
+        )
+
     def reflect_images(self, frames) -> List:
         new_frames = []
 
@@ -60,30 +70,121 @@ class AnimationPlayer:
 
     def create_grass_particles(self, position, groups: List):
         animation_frames = choice(self.frames['leaf'])
-        PartcileEffect(position, animation_frames, groups)
-    
+        self.spawn(position, animation_frames, groups)
+
     def create_particles(self, animation_type, position, groups):
         animation_frames = self.frames[animation_type]
-        PartcileEffect(position, animation_frames, groups)
+        self.spawn(position, animation_frames, groups)
 
+    def spawn(self, position, animation_frames, groups) -> None:
+        # the camera group draws the pool, any other group (attacks) gets a hitbox sprite
+        pool = None
+        hit_groups = []
+        for group in groups:
+            if hasattr(group, 'particles'):
+                pool = group.particles
+            else:
+                hit_groups.append(group)
 
-class PartcileEffect(pygame.sprite.Sprite):
-    def __init__(self, position, animation_frames, *groups: AbstractGroup) -> None:
-        super().__init__(*groups)
+        if pool is not None:
+            pool.spawn(position, animation_frames, hit_groups)
 
+
+class ParticleHitbox(pygame.sprite.Sprite):
+    """Lets a pooled particle take part in attack collisions"""
+
+    def __init__(self, rect: pygame.Rect, *groups: AbstractGroup) -> None:
+        super().__init__(*groups)
         self.sprite_type = 'magic'
-        self.frame_index = 0
-        self.animation_speed = .15
-        self.frames = animation_frames
-        self.image = self.frames[self.frame_index]
-        self.rect = self.image.get_rect(center = position)
-
-    def animate(self):
-        self.frame_index += self.animation_speed
-        if self.frame_index >= len(self.frames) :
-            self.kill()
-        else:
-            self.image = self.frames[int(self.frame_index)]
+        self.rect = rect
+
+
+class ParticlePool:
+    """Every particle effect on screen, kept in preallocated arrays instead of sprites"""
+
+    def __init__(self, capacity: int = PARTICLE_POOL_SIZE) -> None:
+        self.animation_speed = ANIMATION_SPEED
+        self.topleft = np.zeros((capacity, 2), dtype=int)
+        self.start = np.zeros(capacity, dtype=int)
+        self.loop_length = np.zeros(capacity, dtype=int)
+        self.frames_id = np.zeros(capacity, dtype=int)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.hitboxes = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+        # frame lists are shared through the asset cache, each one gets an id and a schedule
+        self.frame_lists = []
+        self.schedules = []
+        self.frame_list_ids = {}
+        self.updated_frame = animation_clock.frame
+
+    def __len__(self) -> int:
+        return int(self.active.sum())
+
+    def grow(self) -> None:
+        capacity = len(self.active)
+        self.topleft = np.concatenate([self.topleft, np.zeros((capacity, 2), dtype=int)])
+        self.start = np.concatenate([self.start, np.zeros(capacity, dtype=int)])
+        self.loop_length = np.concatenate([self.loop_length, np.zeros(capacity, dtype=int)])
+        self.frames_id = np.concatenate([self.frames_id, np.zeros(capacity, dtype=int)])
+        self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+        self.hitboxes += [None] * capacity
+        self.free_slots += range(capacity * 2 - 1, capacity - 1, -1)
+
+    def get_frames_id(self, animation_frames) -> int:
+        key = id(animation_frames)
+        if key not in self.frame_list_ids:
+            self.frame_list_ids[key] = len(self.frame_lists)
+            self.frame_lists.append(animation_frames)
+            self.schedules.append(animation_clock.schedule(len(animation_frames), self.animation_speed))
+        return self.frame_list_ids[key]
+
+    def spawn(self, position, animation_frames, hit_groups=()) -> int:
+        if not self.free_slots:
+            self.grow()
+        slot = self.free_slots.pop()
+
+        rect = animation_frames[0].get_rect(center = position)
+        frames_id = self.get_frames_id(animation_frames)
+        self.topleft[slot] = rect.topleft
+        self.frames_id[slot] = frames_id
+        self.loop_length[slot] = len(self.schedules[frames_id])
+
+        # spawned before this frame's update (e.g. a spell cast by the player), it already plays this frame
+        self.start[slot] = animation_clock.frame
+        if self.updated_frame != animation_clock.frame:
+            self.start[slot] -= 1
+        self.active[slot] = True
+        if hit_groups:
+            self.hitboxes[slot] = ParticleHitbox(rect, *hit_groups)
+
+        return slot
 
     def update(self) -> None:
-        self.animate()
+        self.updated_frame = animation_clock.frame
+        elapsed = animation_clock.frame - self.start
+
+        # a particle plays its animation once
+        for slot in np.flatnonzero(self.active & (elapsed >= self.loop_length)):
+            self.active[slot] = False
+            self.free_slots.append(slot)
+            if self.hitboxes[slot]:
+                self.hitboxes[slot].kill()
+                self.hitboxes[slot] = None
+
+    def draw(self, surface: pygame.Surface, camera_rect: pygame.Rect) -> List[pygame.Rect]:
+        """Blits every live particle, returns the screen areas drawn"""
+        slots = np.flatnonzero(self.active)
+        if not len(slots):
+            return []
+
+        frame_lists = self.frame_lists
+        schedules = self.schedules
+        frames_ids = self.frames_id[slots].tolist()
+        elapsed = (animation_clock.frame - self.start[slots]).tolist()
+        positions = (self.topleft[slots] - camera_rect.topleft).tolist()
+
+        return surface.blits([
+            (frame_lists[frames_id][schedules[frames_id][steps]], position)
+            for frames_id, steps, position in zip(frames_ids, elapsed, positions)
+        ])
@@ -4,20 +4,15 @@ import pygame
 
 from settings import *
 from src.player.player import Player
+from src.sounds import sounds
 
 class MagicPlayer:
     def __init__(self, animation_player) -> None:
         self.animation_player = animation_player
-        self.sounds = {
-            'heal': pygame.mixer.Sound('./audio/heal.wav'),
-            'flame': pygame.mixer.Sound('./audio/fire.wav')
-        }
 
     def heal(self, player: Player, strength, magic_cost, groups):
         if player.energy >= magic_cost:
-            sound = self.sounds['heal']
-            sound.set_volume(.05)
-            sound.play()
+            sounds.play('heal', player=True)
 
             player.health += strength
             player.energy -= magic_cost
@@ -38,9 +33,7 @@ class MagicPlayer:
 
     def flame(self, player: Player, cost, groups):
         if player.energy >= cost:
-            sound = self.sounds['flame']
-            sound.set_volume(.05)
-            sound.play()
+            sounds.play('flame', player=True)
 
             player.energy -= cost
         
@@ -3,6 +3,11 @@ from typing import Union
 import pygame
 
 from settings import *
+from src.animation import animation_clock
+from src.assets import assets
+from src.clock import get_ticks
+from src.controls import get_pressed
+from src.sounds import sounds
 from src.support import import_folder_imgs
 from src.entity import Entity
 
@@ -18,13 +23,14 @@ class Player(Entity):
         create_magic
     ) -> None:
         super().__init__(*groups)
-        self.image = pygame.image.load('./graphics/player/player.png').convert_alpha()
+        self.image = assets.image('./graphics/player/player.png')
         self.rect = self.image.get_rect(topleft = pos)
         self.hitbox = self.rect.inflate(-6, HITBOX_OFFSET['player'])
 
         # Graphics Setup
         self.import_player_assets()
         self.status = 'down'
+        self.animation_status = self.status
 
         # Movement
         self.attaking = False
@@ -69,11 +75,6 @@ class Player(Entity):
         self.hurt_time = None
         self.invulnerability_duration = 500
 
-        # Import sound
-        self.weapon_attack_sound = pygame.mixer.Sound('./audio/sword.wav')     
-        self.weapon_attack_sound.set_volume(.05)
-
-
     def import_player_assets(self) -> None:
         player_path = './graphics/player/'
         self.animations = {
@@ -99,7 +100,7 @@ class Player(Entity):
         """Map the keyboard key to generate an action on player"""
 
         if not self.attaking:
-            keys = pygame.key.get_pressed()
+            keys = get_pressed()
 
             # movement input
             if keys[pygame.K_UP]:
@@ -123,14 +124,14 @@ class Player(Entity):
             # attack input
             if keys[pygame.K_SPACE]:
                 self.attaking = True
-                self.attack_time = pygame.time.get_ticks()
+                self.attack_time = get_ticks()
                 self.create_attack()
-                self.weapon_attack_sound.play()
+                sounds.play('sword', player=True)
 
             # magic input
             if keys[pygame.K_LCTRL]:
                 self.attaking = True
-                self.attack_time = pygame.time.get_ticks()
+                self.attack_time = get_ticks()
 
                 style = list(MAGIC_DATA.keys())[self.magic_index]
                 strength = list(MAGIC_DATA.values())[self.magic_index]['strength'] + self.stats['magic']
@@ -140,7 +141,7 @@ class Player(Entity):
             # select weapon
             if keys[pygame.K_w] and self.can_switch_weapon:
                 self.can_switch_weapon = False
-                self.weapon_switch_time = pygame.time.get_ticks()
+                self.weapon_switch_time = get_ticks()
 
                 if self.weapon_index < len(list(WEAPON_DATA.keys())) - 1:
                     self.weapon_index += 1
@@ -151,7 +152,7 @@ class Player(Entity):
             # select magic
             if keys[pygame.K_q] and self.can_switch_magic:
                 self.can_switch_magic = False
-                self.magic_switch_time = pygame.time.get_ticks()
+                self.magic_switch_time = get_ticks()
 
                 if self.magic_index < len(list(MAGIC_DATA.keys())) - 1:
                     self.magic_index += 1
@@ -180,7 +181,7 @@ class Player(Entity):
 
     def cooldowns(self) -> None:
         """Check the time of attack and magic actions to cooldown the actions"""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         if self.attaking:
             if current_time - self.attack_time >= self.attack_cooldown + WEAPON_DATA[self.weapon]['cooldown']:
                 self.attaking = False
@@ -201,14 +202,16 @@ class Player(Entity):
     def animate(self) -> None:
         animation = self.animations[self.status]
 
-        # Loop over the frame index
-        self.frame_index += self.animation_speed
+        # a new status starts its animation from the first frame
+        if self.status != self.animation_status:
+            self.animation_status = self.status
+            self.animation_start = animation_clock.frame
+        frame_index, self.animation_start = animation_clock.frame_index(
+            self.animation_start, len(animation), self.animation_speed
+        )
 
-        if self.frame_index >= len(animation):
-            self.frame_index = 0
-        
         # Set the image
-        self.image = animation[int(self.frame_index)]
+        self.image = animation[frame_index]
         self.rect = self.image.get_rect(center = self.hitbox.center)
 
         # Flicker
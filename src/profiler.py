@@ -0,0 +1,146 @@
+import csv
+import json
+from collections import deque
+from time import perf_counter
+from typing import Dict, List
+
+import pygame
+
+from settings import *
+
+
+class Section:
+    """Times one named phase, reused every frame so timing allocates nothing"""
+
+    def __init__(self, profiler: 'Profiler', name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> None:
+        if self.profiler.enabled:
+            self.start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        if self.profiler.enabled:
+            self.profiler.record(self.name, (perf_counter() - self.start) * 1000)
+
+
+class Profiler:
+    def __init__(self, window: int = PROFILER_WINDOW) -> None:
+        self.enabled = False
+        self.show_overlay = False
+        # keep every frame for dump(), only when the timings are written out
+        self.recording = False
+        self.window = window
+
+        # rolling samples per section in ms, and every finished frame for the dump
+        self.samples: Dict[str, deque] = {}
+        self.sections: Dict[str, Section] = {}
+        self.current_frame: Dict[str, float] = {}
+        self.frames: List[Dict[str, float]] = []
+
+        self.font = None
+        self.overlay_surface = None
+        self.frames_since_overlay = 0
+
+    def section(self, name: str) -> Section:
+        if name not in self.sections:
+            self.sections[name] = Section(self, name)
+        return self.sections[name]
+
+    def record(self, name: str, ms: float) -> None:
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.window)
+        self.samples[name].append(ms)
+        self.current_frame[name] = self.current_frame.get(name, 0) + ms
+
+    def start_recording(self) -> None:
+        self.recording = True
+        self.enabled = True
+
+    def end_frame(self) -> None:
+        if self.current_frame:
+            if self.recording:
+                self.frames.append(self.current_frame)
+            self.current_frame = {}
+
+    def toggle_overlay(self) -> None:
+        # timing only runs while someone looks at it or it gets written out
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.recording
+
+    def percentile(self, samples: List[float], percent: float) -> float:
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+    def summary(self, all_frames: bool = False) -> Dict[str, Dict[str, float]]:
+        """Percentiles over the rolling window, or over every recorded frame"""
+        if all_frames:
+            samples_by_name = {name: [frame[name] for frame in self.frames if name in frame] for name in self.samples}
+        else:
+            samples_by_name = self.samples
+
+        summary = {}
+        for name, samples in samples_by_name.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            summary[name] = {
+                'mean': sum(ordered) / len(ordered),
+                'p50': self.percentile(ordered, 50),
+                'p95': self.percentile(ordered, 95),
+                'p99': self.percentile(ordered, 99),
+                'max': ordered[-1]
+            }
+        return summary
+
+    def render_overlay(self) -> pygame.Surface:
+        if self.font is None:
+            self.font = pygame.font.Font(UI_FONT, PROFILER_FONT_SIZE)
+
+        lines = [f'{"ms":<24}{"p50":>7}{"p95":>7}{"p99":>7}']
+        for name, stats in self.summary().items():
+            lines.append(f'{name:<24}{stats["p50"]:>7.2f}{stats["p95"]:>7.2f}{stats["p99"]:>7.2f}')
+
+        line_height = self.font.get_linesize()
+        width = max(self.font.size(line)[0] for line in lines) + 20
+        surface = pygame.Surface((width, line_height * len(lines) + 20))
+        surface.fill(UI_BG_COLOR)
+        surface.set_alpha(220)
+
+        for index, line in enumerate(lines):
+            text_surf = self.font.render(line, False, TEXT_COLOR)
+            surface.blit(text_surf, (10, 10 + index * line_height))
+
+        return surface
+
+    def draw(self, surface: pygame.Surface) -> pygame.Rect:
+        if not self.show_overlay or not self.samples:
+            return None
+
+        # re-rendering the text every frame would show up in the numbers
+        self.frames_since_overlay += 1
+        if self.overlay_surface is None or self.frames_since_overlay >= PROFILER_OVERLAY_REFRESH:
+            self.overlay_surface = self.render_overlay()
+            self.frames_since_overlay = 0
+
+        overlay_rect = self.overlay_surface.get_rect(topright = (surface.get_width() - 10, 10))
+        return surface.blit(self.overlay_surface, overlay_rect)
+
+    def dump(self, path: str) -> None:
+        """json with the percentiles per section, or csv with one row per frame"""
+        if path.endswith('.csv'):
+            names = list(self.samples)
+            with open(path, 'w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(['frame'] + names)
+                for index, frame in enumerate(self.frames):
+                    writer.writerow([index] + [round(frame.get(name, 0), 4) for name in names])
+        else:
+            with open(path, 'w') as json_file:
+                json.dump({'frames': len(self.frames), 'sections': self.summary(all_frames=True)}, json_file, indent=2)
+
+
+# shared by Game and Level
+profiler = Profiler()
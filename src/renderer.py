@@ -0,0 +1,119 @@
+from typing import List
+from weakref import WeakKeyDictionary
+
+import pygame
+from pygame.surface import Surface
+
+from settings import *
+
+
+class TextureRenderer:
+    """Draws through an SDL renderer with textures instead of blitting on the window surface.
+
+    It takes the place of the display surface (``get_size``, ``blit``,
+    ``blits``, ``fill``, ``copy``), so the camera, the HUD and the menu draw
+    the same way on both backends. Every surface is uploaded once and its
+    texture lives as long as the surface does, a surface that is drawn on
+    after its first upload must go through ``invalidate``.
+    """
+
+    def __init__(self, size, accelerated: bool = True) -> None:
+        from pygame._sdl2.sdl2 import error as SDLError
+        from pygame._sdl2.video import Renderer, Texture, Window
+
+        self.Texture = Texture
+        self.window = Window('A Dev Entures In Forest', size=size)
+        try:
+            self.renderer = Renderer(self.window, accelerated=1 if accelerated else 0)
+        except SDLError:
+            # no GPU driver (e.g. headless), SDL's software renderer takes the same textures
+            self.renderer = Renderer(self.window, accelerated=0)
+        self.size = size
+        self.textures = WeakKeyDictionary()
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self) -> int:
+        return self.size[0]
+
+    def get_height(self) -> int:
+        return self.size[1]
+
+    def get_rect(self, **kwargs) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), self.size)
+        for attribute, value in kwargs.items():
+            setattr(rect, attribute, value)
+        return rect
+
+    def texture(self, surface: Surface):
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def invalidate(self, surface: Surface) -> None:
+        self.textures.pop(surface, None)
+
+    def fill(self, color) -> None:
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def blit(self, surface: Surface, dest, area=None, special_flags=0) -> pygame.Rect:
+        texture = self.texture(surface)
+
+        # per-surface alpha (hit flicker, overlays) becomes the texture alpha
+        alpha = surface.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+
+        if area is not None:
+            area = pygame.Rect(area)
+            dest_rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+            texture.draw(srcrect=area, dstrect=dest_rect)
+        else:
+            dest_rect = pygame.Rect(dest[0], dest[1], *surface.get_size())
+            texture.draw(dstrect=dest_rect)
+
+        return dest_rect.clip(pygame.Rect((0, 0), self.size))
+
+    def blits(self, blit_sequence, doreturn=True) -> List[pygame.Rect]:
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def copy(self) -> Surface:
+        return self.renderer.to_surface()
+
+    def present(self) -> None:
+        self.renderer.present()
+
+
+display = None
+
+
+def create_display(size, backend: str = RENDERER):
+    """The window to draw on, a Surface for 'software' or a TextureRenderer for 'sdl2'"""
+    global display
+
+    if backend == 'sdl2':
+        # a hidden display mode still gives convert() and convert_alpha() a pixel format
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        display = TextureRenderer(size, accelerated=RENDERER_ACCELERATED)
+    else:
+        display = pygame.display.set_mode(size)
+
+    return display
+
+
+def get_display():
+    """What the game draws on, use instead of pygame.display.get_surface"""
+    return display if display is not None else pygame.display.get_surface()
+
+
+def present(rects=None) -> None:
+    if isinstance(display, TextureRenderer):
+        display.present()
+    elif rects is not None:
+        pygame.display.update(rects)
+    else:
+        pygame.display.update()
@@ -0,0 +1,106 @@
+from math import hypot
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from settings import *
+from src.assets import assets
+from src.clock import get_ticks
+
+
+class SoundManager:
+    """Plays the SOUND_EFFECTS, one shared Sound per effect.
+
+    Each effect has a cap on the copies playing at once and a cooldown
+    between two starts, so a crowd of monsters hitting at the same time is
+    heard once instead of filling every channel. The player's sounds play on
+    SOUND_PLAYER_CHANNELS reserved channels that monsters can never take.
+    Sounds of the world fade with their distance to the listener (the
+    player) and are not played at all off screen.
+    """
+
+    def __init__(
+        self,
+        channels: int = SOUND_CHANNELS,
+        player_channels: int = SOUND_PLAYER_CHANNELS,
+        volume: float = SOUND_VOLUME
+    ) -> None:
+        self.channel_count = channels
+        self.player_channel_count = player_channels
+        self.volume = volume
+        self.listener = None
+        self.ready = False
+        self.player_channels: List[pygame.mixer.Channel] = []
+
+        self.voices: Dict[str, List[pygame.mixer.Channel]] = {}
+        self.last_played: Dict[str, int] = {}
+        self.played = 0
+        self.dropped = 0
+
+    def setup(self) -> bool:
+        # the mixer may only be opened after the manager was made
+        if not self.ready and pygame.mixer.get_init():
+            pygame.mixer.set_num_channels(self.channel_count)
+            pygame.mixer.set_reserved(self.player_channel_count)
+            self.player_channels = [pygame.mixer.Channel(index) for index in range(self.player_channel_count)]
+            self.ready = True
+        return self.ready
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        return assets.sound(SOUND_EFFECTS[name]['path'])
+
+    def attenuation(self, position: Tuple[float, float]) -> float:
+        """Volume factor of a sound at position, 0 when it is off screen or too far"""
+        if self.listener is None:
+            return 1
+
+        listener_x, listener_y = self.listener.rect.center
+        offset_x, offset_y = position[0] - listener_x, position[1] - listener_y
+        if abs(offset_x) > WIDTH // 2 or abs(offset_y) > HEIGTH // 2:
+            return 0
+        return max(0, 1 - hypot(offset_x, offset_y) / SOUND_FALLOFF_DISTANCE)
+
+    def play(self, name: str, position: Tuple[float, float] = None, player: bool = False) -> Optional[pygame.mixer.Channel]:
+        """Start an effect, at a position of the world or from the player, None when it was dropped"""
+        if not self.setup():
+            return None
+
+        effect = SOUND_EFFECTS[name]
+        current_time = get_ticks()
+        last_played = self.last_played.get(name)
+        if last_played is not None and current_time - last_played < effect['cooldown']:
+            self.dropped += 1
+            return None
+
+        volume = self.volume
+        if position is not None and not player:
+            volume *= self.attenuation(position)
+            if volume <= 0:
+                self.dropped += 1
+                return None
+
+        sound = self.sound(name)
+        voices = [channel for channel in self.voices.get(name, ()) if channel.get_sound() is sound]
+        if len(voices) >= effect['voices']:
+            self.dropped += 1
+            return None
+
+        if player:
+            channel = next((channel for channel in self.player_channels if not channel.get_busy()), None)
+        else:
+            # never steals a playing channel, the reserved ones are left out
+            channel = pygame.mixer.find_channel()
+        if channel is None:
+            self.dropped += 1
+            return None
+
+        channel.play(sound)
+        channel.set_volume(volume)
+        voices.append(channel)
+        self.voices[name] = voices
+        self.last_played[name] = current_time
+        self.played += 1
+        return channel
+
+
+sounds = SoundManager()
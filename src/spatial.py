@@ -0,0 +1,127 @@
+from typing import Dict, Iterable, List, Tuple
+
+import pygame
+
+from settings import *
+
+
+class SpatialHash:
+    def __init__(self, cell_size: int = TILESIZE, rect_attr: str = 'hitbox') -> None:
+        self.cell_size = cell_size
+        self.rect_attr = rect_attr
+
+        # cell -> sprites in it (dicts keep insertion order, like a group)
+        self.cells: Dict[Tuple[int, int], Dict] = {}
+        self.sprite_cells: Dict[pygame.sprite.Sprite, List[Tuple[int, int]]] = {}
+
+    def cells_for_rect(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        size = self.cell_size
+        left = rect.left // size
+        top = rect.top // size
+        # right/bottom are exclusive, a rect touching a cell edge is not in it
+        right = (rect.right - 1) // size if rect.width > 0 else left
+        bottom = (rect.bottom - 1) // size if rect.height > 0 else top
+
+        return [
+            (col, row)
+            for row in range(top, bottom + 1)
+            for col in range(left, right + 1)
+        ]
+
+    def insert(self, sprite) -> None:
+        if sprite in self.sprite_cells:
+            self.remove(sprite)
+
+        cells = self.cells_for_rect(getattr(sprite, self.rect_attr))
+        for cell in cells:
+            self.cells.setdefault(cell, {})[sprite] = None
+        self.sprite_cells[sprite] = cells
+
+    def remove(self, sprite) -> None:
+        for cell in self.sprite_cells.pop(sprite, ()):
+            bucket = self.cells[cell]
+            del bucket[sprite]
+            if not bucket:
+                del self.cells[cell]
+
+    def relocate(self, sprite) -> None:
+        """Update the cells of a sprite that has moved"""
+        cells = self.cells_for_rect(getattr(sprite, self.rect_attr))
+        if cells != self.sprite_cells.get(sprite):
+            self.insert(sprite)
+
+    def query(self, rect: pygame.Rect) -> List:
+        """Every sprite in the cells overlapped by the rect, without duplicates"""
+        found = {}
+        for cell in self.cells_for_rect(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+
+        return list(found)
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.sprite_cells.clear()
+
+    def __contains__(self, sprite) -> bool:
+        return sprite in self.sprite_cells
+
+    def __len__(self) -> int:
+        return len(self.sprite_cells)
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Sprite group that keeps a spatial hash of its sprites.
+
+    Sprites are usually added to groups before their rects exist (``Tile``
+    and ``Entity`` call ``super().__init__(*groups)`` first), so new sprites
+    are indexed lazily on the next query.
+    """
+
+    def __init__(self, *sprites, cell_size: int = TILESIZE, rect_attr: str = 'hitbox') -> None:
+        self.spatial_hash = SpatialHash(cell_size, rect_attr)
+        self.rect_attr = rect_attr
+        self.pending = {}
+        # when each sprite joined, collide() answers in group order like spritecollide
+        self.join_order = {}
+        self.joined = 0
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None) -> None:
+        super().add_internal(sprite, layer)
+        self.pending[sprite] = None
+        self.join_order[sprite] = self.joined
+        self.joined += 1
+
+    def remove_internal(self, sprite) -> None:
+        super().remove_internal(sprite)
+        self.pending.pop(sprite, None)
+        self.join_order.pop(sprite, None)
+        self.spatial_hash.remove(sprite)
+
+    def flush(self) -> None:
+        if self.pending:
+            for sprite in self.pending:
+                self.spatial_hash.insert(sprite)
+            self.pending.clear()
+
+    def relocate(self, sprite) -> None:
+        if sprite in self.spatial_hash:
+            self.spatial_hash.relocate(sprite)
+
+    def relocate_all(self, sprites: Iterable) -> None:
+        for sprite in sprites:
+            self.relocate(sprite)
+
+    def query(self, rect: pygame.Rect) -> List:
+        self.flush()
+        return self.spatial_hash.query(rect)
+
+    def collide(self, rect: pygame.Rect) -> List:
+        """Sprites overlapping the rect, the same list pygame.sprite.spritecollide gives"""
+        rect_attr = self.rect_attr
+        hits = [sprite for sprite in self.query(rect) if getattr(sprite, rect_attr).colliderect(rect)]
+        if len(hits) > 1:
+            hits.sort(key=self.join_order.__getitem__)
+        return hits
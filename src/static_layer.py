@@ -0,0 +1,79 @@
+from typing import Dict, List, Tuple
+
+import pygame
+from pygame.surface import Surface
+
+from settings import *
+from src.spatial import SpatialHash
+
+
+class StaticLayer:
+    """Floor and static tiles pre-composited into chunk surfaces.
+
+    Chunks are baked the first time they are seen and baked again only after
+    a tile inside them is added or killed (e.g. cut grass).
+    """
+
+    def __init__(self, floor_surface: Surface, chunk_size: int = STATIC_CHUNK_SIZE) -> None:
+        self.floor_surface = floor_surface
+        self.floor_rect = floor_surface.get_rect(topleft = (0,0))
+        self.chunk_size = chunk_size
+
+        # tiles are indexed by chunk so a bake only touches its own tiles
+        self.tiles = SpatialHash(cell_size=chunk_size, rect_attr='rect')
+        self.chunks: Dict[Tuple[int, int], Surface] = {}
+        self.dirty_chunks = set()
+
+    def add(self, sprite) -> None:
+        self.tiles.insert(sprite)
+        self.dirty_chunks.update(self.tiles.sprite_cells[sprite])
+
+    def remove(self, sprite) -> None:
+        self.dirty_chunks.update(self.tiles.sprite_cells.get(sprite, ()))
+        self.tiles.remove(sprite)
+
+    def release(self, area: pygame.Rect) -> None:
+        """Forget the baked chunks inside an area of the world that was unloaded"""
+        for chunk in self.tiles.cells_for_rect(area):
+            if area.contains(self.chunk_rect(chunk)):
+                self.chunks.pop(chunk, None)
+                self.dirty_chunks.discard(chunk)
+
+    def chunk_rect(self, chunk: Tuple[int, int]) -> pygame.Rect:
+        size = self.chunk_size
+        return pygame.Rect(chunk[0] * size, chunk[1] * size, size, size)
+
+    def bake_chunk(self, chunk: Tuple[int, int]) -> Surface:
+        chunk_rect = self.chunk_rect(chunk)
+        surface = Surface(chunk_rect.size).convert()
+
+        # the screen behind the map is water, so the chunk can be fully opaque
+        surface.fill(WATER_COLOR)
+        surface.blit(self.floor_surface, (-chunk_rect.x, -chunk_rect.y))
+
+        tiles = sorted(self.tiles.query(chunk_rect), key=lambda sprite: sprite.rect.centery)
+        for sprite in tiles:
+            surface.blit(sprite.image, (sprite.rect.x - chunk_rect.x, sprite.rect.y - chunk_rect.y))
+
+        self.chunks[chunk] = surface
+        self.dirty_chunks.discard(chunk)
+        return surface
+
+    def visible_chunks(self, camera_rect: pygame.Rect) -> List[Tuple[int, int]]:
+        return [
+            chunk for chunk in self.tiles.cells_for_rect(camera_rect)
+            if chunk in self.tiles.cells or self.chunk_rect(chunk).colliderect(self.floor_rect)
+        ]
+
+    def draw(self, surface: Surface, camera_rect: pygame.Rect) -> None:
+        blit_sequence = []
+        for chunk in self.visible_chunks(camera_rect):
+            chunk_surface = self.chunks.get(chunk)
+            if chunk_surface is None or chunk in self.dirty_chunks:
+                chunk_surface = self.bake_chunk(chunk)
+
+            x = chunk[0] * self.chunk_size - camera_rect.x
+            y = chunk[1] * self.chunk_size - camera_rect.y
+            blit_sequence.append((chunk_surface, (x, y)))
+
+        surface.blits(blit_sequence, doreturn=False)
@@ -1,14 +1,21 @@
 import pygame
 
 from settings import *
+from src.assets import assets
+from src.renderer import get_display
 from src.player.player import Player
 
 class Ui:
     def __init__(self) -> None:
         # general
-        self.display_surface = pygame.display.get_surface()
+        self.display_surface = get_display()
         self.font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
 
+        # HUD parts are rendered once and kept until what they show changes
+        self.parts = {}
+        self.text_cache = {}
+        self.dirty_rects = []
+
         # bar setup
         self.health_bar_rect = pygame.Rect(
             10, 10, HEALTH_BAR_WIDTH, BAR_HEIGHT
@@ -20,81 +27,128 @@ class Ui:
         # convert weapon dictionary
         self.weapon_graphics = []
         for weapon in WEAPON_DATA.values():
-            path = weapon['graphic']
-            weapon = pygame.image.load(path).convert_alpha()
+            weapon = assets.image(weapon['graphic'])
             self.weapon_graphics.append(weapon)
 
         # convert magic dictionary
         self.magic_graphics = []
         for magic in MAGIC_DATA.values():
-            path = magic['graphic']
-            weapon = pygame.image.load(path).convert_alpha()
-            self.magic_graphics.append(weapon)
+            magic = assets.image(magic['graphic'])
+            self.magic_graphics.append(magic)
 
-    def show_bar(self, current, max_amount, bg_rect, color):
+    def show_bar(self, surface, current, max_amount, bg_rect, color):
         # draw bg
-        pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_rect)
+        pygame.draw.rect(surface, UI_BG_COLOR, bg_rect)
 
         # converting stat to pixel
+        current_rect = self.bar_rect(current, max_amount, bg_rect)
+
+        # drawing the bar
+        pygame.draw.rect(surface, color, current_rect)
+        pygame.draw.rect(surface, UI_BORDER_COLOR, bg_rect, 3)
+
+    def bar_rect(self, current, max_amount, bg_rect) -> pygame.Rect:
         ratio = current / max_amount
         current_width = bg_rect.width * ratio
         current_rect = bg_rect.copy()
         current_rect.width = current_width
+        return current_rect
 
-        # drawing the bar
-        pygame.draw.rect(self.display_surface, color, current_rect)
-        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_rect, 3)
+    def render_text(self, text: str) -> pygame.Surface:
+        if text not in self.text_cache:
+            if len(self.text_cache) >= UI_TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            self.text_cache[text] = self.font.render(text, False, TEXT_COLOR)
+        return self.text_cache[text]
 
-    def show_exp(self, exp: int) -> None:
-        text_surf = self.font.render(str(int(exp)), False, TEXT_COLOR)
+    def show_exp(self, exp: int):
+        text_surf = self.render_text(str(int(exp)))
         x = self.display_surface.get_size()[0] - 20
         y = self.display_surface.get_size()[1] - 20
         text_rect = text_surf.get_rect(bottomright = (x, y))
+        bg_rect = text_rect.inflate(20, 20)
 
-        pygame.draw.rect(self.display_surface, UI_BG_COLOR, text_rect.inflate(20, 20))
-        self.display_surface.blit(text_surf, text_rect)
-        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, text_rect.inflate(20,20), 3)
+        surface = pygame.Surface(bg_rect.size).convert()
+        local_rect = bg_rect.move(-bg_rect.x, -bg_rect.y)
+        pygame.draw.rect(surface, UI_BG_COLOR, local_rect)
+        surface.blit(text_surf, text_rect.move(-bg_rect.x, -bg_rect.y))
+        pygame.draw.rect(surface, UI_BORDER_COLOR, local_rect, 3)
 
-    def selection_box(self, left: int, top: int, has_switched_weapon: bool) -> pygame.Rect:
-        bg_rect = pygame.Rect(left, top, ITEM_BOX_SIZE, ITEM_BOX_SIZE)
-        pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_rect)
+        return surface, bg_rect.topleft
+
+    def selection_box(self, surface, has_switched_weapon: bool) -> pygame.Rect:
+        bg_rect = pygame.Rect(0, 0, ITEM_BOX_SIZE, ITEM_BOX_SIZE)
+        pygame.draw.rect(surface, UI_BG_COLOR, bg_rect)
 
         if has_switched_weapon:
-            pygame.draw.rect(self.display_surface, UI_BORDER_COLOR_ACTIVE, bg_rect, 3)
+            pygame.draw.rect(surface, UI_BORDER_COLOR_ACTIVE, bg_rect, 3)
         else:
-            pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_rect, 3)
+            pygame.draw.rect(surface, UI_BORDER_COLOR, bg_rect, 3)
 
         return bg_rect
 
-    def weapon_overlay(self, weapon_index: int, has_switched_weapon: bool) -> None:
-        bg_rect = self.selection_box(10,630, has_switched_weapon)
-        weapon_surf = self.weapon_graphics[weapon_index]
-        weapon_rect = weapon_surf.get_rect(center = bg_rect.center)
+    def item_overlay(self, left: int, top: int, item_surf, has_switched: bool):
+        surface = pygame.Surface((ITEM_BOX_SIZE, ITEM_BOX_SIZE)).convert()
+        bg_rect = self.selection_box(surface, has_switched)
+        surface.blit(item_surf, item_surf.get_rect(center = bg_rect.center))
 
-        self.display_surface.blit(weapon_surf, weapon_rect)
+        return surface, (left, top)
 
-    def magic_overlay(self, magic_index: int, has_switched_magic: bool) -> None:
-        bg_rect = self.selection_box(100,630, has_switched_magic)
-        magic_surf = self.magic_graphics[magic_index]
-        magic_rect = magic_surf.get_rect(center = bg_rect.center)
+    def weapon_overlay(self, weapon_index: int, has_switched_weapon: bool):
+        return self.item_overlay(10, 630, self.weapon_graphics[weapon_index], has_switched_weapon)
 
-        self.display_surface.blit(magic_surf, magic_rect)
+    def magic_overlay(self, magic_index: int, has_switched_magic: bool):
+        return self.item_overlay(100, 630, self.magic_graphics[magic_index], has_switched_magic)
+
+    def bar_overlay(self, player: Player):
+        area = self.health_bar_rect.union(self.energy_bar_rect)
+        surface = pygame.Surface(area.size, pygame.SRCALPHA)
 
-    def display(self, player: Player) -> None:
         self.show_bar(
+            surface,
             player.health,
             player.stats['health'],
-            self.health_bar_rect,
+            self.health_bar_rect.move(-area.x, -area.y),
             HEALTH_COLOR
         )
         self.show_bar(
+            surface,
             player.energy,
             player.stats['energy'],
-            self.energy_bar_rect,
+            self.energy_bar_rect.move(-area.x, -area.y),
             ENERGY_COLOR
         )
-        
-        self.show_exp(player.exp)
 
-        self.weapon_overlay(player.weapon_index, not player.can_switch_weapon)
-        self.magic_overlay(player.magic_index, not player.can_switch_magic)
+        return surface, area.topleft
+
+    def update_part(self, name: str, state, render) -> None:
+        """Render a part of the HUD again only when the state it shows has changed"""
+        part = self.parts.get(name)
+        if part is None or part[0] != state:
+            surface, position = render()
+            self.parts[name] = (state, surface, position)
+
+            # both the old and the new area, the exp box changes size
+            self.dirty_rects.append(surface.get_rect(topleft = position))
+            if part:
+                self.dirty_rects.append(part[1].get_rect(topleft = part[2]))
+
+    def display(self, player: Player) -> None:
+        self.dirty_rects = []
+
+        # the bars only change when their filled width changes by a whole pixel
+        health_width = self.bar_rect(player.health, player.stats['health'], self.health_bar_rect).width
+        energy_width = self.bar_rect(player.energy, player.stats['energy'], self.energy_bar_rect).width
+        self.update_part('bars', (health_width, energy_width), lambda: self.bar_overlay(player))
+
+        self.update_part('exp', int(player.exp), lambda: self.show_exp(player.exp))
+
+        weapon_state = (player.weapon_index, not player.can_switch_weapon)
+        self.update_part('weapon', weapon_state, lambda: self.weapon_overlay(*weapon_state))
+        magic_state = (player.magic_index, not player.can_switch_magic)
+        self.update_part('magic', magic_state, lambda: self.magic_overlay(*magic_state))
+
+        self.display_surface.blits(
+            [(surface, position) for _, surface, position in self.parts.values()],
+            doreturn=False
+        )
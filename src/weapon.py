@@ -2,6 +2,8 @@ from enum import Enum
 
 import pygame
 
+from src.assets import assets
+
 
 class Weapon(pygame.sprite.Sprite):
     def __init__(self, player, groups) -> None:
@@ -11,7 +13,7 @@ class Weapon(pygame.sprite.Sprite):
 
         # Graphic
         full_path = f'./graphics/weapons/{player.weapon}/{direction}.png'
-        self.image = pygame.image.load(full_path).convert_alpha()
+        self.image = assets.image(full_path)
 
         # Placement
         if direction == 'right':
@@ -0,0 +1,121 @@
+from typing import Callable, Dict, List, Set, Tuple
+
+import pygame
+
+from settings import *
+from src.map_data import MapLayer
+
+Chunk = Tuple[int, int]
+
+
+class ChunkedWorld:
+    """Keeps only the map around the player alive as sprites.
+
+    The map is split in square chunks, the chunks within WORLD_LOAD_RADIUS of
+    the player are turned into tiles and monsters and the ones further than
+    WORLD_UNLOAD_RADIUS are killed again. What happened in a chunk survives
+    the unload: cut grass stays cut, dead monsters stay dead and the living
+    ones come back where they were left, with their health.
+    """
+
+    def __init__(
+        self,
+        layouts: Dict[str, MapLayer],
+        create_tile: Callable,
+        create_enemy: Callable,
+        enemy_sprites: pygame.sprite.AbstractGroup,
+        static_layer,
+        chunk_tiles: int = WORLD_CHUNK_SIZE
+    ) -> None:
+        self.layouts = layouts
+        self.create_tile = create_tile
+        self.create_enemy = create_enemy
+        self.enemy_sprites = enemy_sprites
+        self.static_layer = static_layer
+
+        self.chunk_tiles = chunk_tiles
+        self.chunk_size = chunk_tiles * TILESIZE
+        self.current_chunk = None
+
+        # live sprites of the loaded chunks, tiles stay in the chunk they were loaded for
+        self.loaded: Dict[Chunk, List[Tuple[pygame.sprite.Sprite, Tuple[int, int]]]] = {}
+
+        # what survives an unload
+        self.visited: Set[Chunk] = set()
+        self.cut_grass: Set[Tuple[int, int]] = set()
+        self.stored_enemies: Dict[Chunk, List[Tuple[str, Tuple[int, int], int]]] = {}
+
+    def chunk_at(self, position) -> Chunk:
+        return int(position[0] // self.chunk_size), int(position[1] // self.chunk_size)
+
+    def chunk_rect(self, chunk: Chunk) -> pygame.Rect:
+        size = self.chunk_size
+        return pygame.Rect(chunk[0] * size, chunk[1] * size, size, size)
+
+    def chunks_around(self, chunk: Chunk, radius: int) -> List[Chunk]:
+        return [
+            (chunk[0] + x, chunk[1] + y)
+            for y in range(-radius, radius + 1)
+            for x in range(-radius, radius + 1)
+        ]
+
+    def update(self, position) -> None:
+        """Load and unload chunks, only does work when the player enters another chunk"""
+        chunk = self.chunk_at(position)
+        if chunk == self.current_chunk:
+            return
+        self.current_chunk = chunk
+
+        # unloading waits for a wider radius so walking along a border does not thrash
+        far_chunks = [
+            loaded for loaded in self.loaded
+            if max(abs(loaded[0] - chunk[0]), abs(loaded[1] - chunk[1])) > WORLD_UNLOAD_RADIUS
+        ]
+        if far_chunks:
+            self.unload_chunks(far_chunks)
+
+        for near_chunk in self.chunks_around(chunk, WORLD_LOAD_RADIUS):
+            if near_chunk not in self.loaded:
+                self.load_chunk(near_chunk)
+
+    def load_chunk(self, chunk: Chunk) -> None:
+        left, top = chunk[0] * self.chunk_tiles, chunk[1] * self.chunk_tiles
+        sprites = []
+
+        for style, layout in self.layouts.items():
+            if style == 'entities':
+                continue
+            for col, row, value in layout.region(left, top, self.chunk_tiles, self.chunk_tiles):
+                if style == 'grass' and (col, row) in self.cut_grass:
+                    continue
+                sprites.append((self.create_tile(style, col, row, value), (col, row)))
+
+        # monsters come from the map the first time, afterwards from what was stored
+        if chunk not in self.visited:
+            self.visited.add(chunk)
+            for col, row, value in self.layouts['entities'].region(left, top, self.chunk_tiles, self.chunk_tiles):
+                if value != PLAYER_ENTITY_ID:
+                    self.create_enemy(ENTITY_MONSTERS.get(value, 'squid'), (col * TILESIZE, row * TILESIZE))
+
+        for monster_name, position, health in self.stored_enemies.pop(chunk, ()):
+            self.create_enemy(monster_name, position, health)
+
+        self.loaded[chunk] = sprites
+
+    def unload_chunks(self, chunks: List[Chunk]) -> None:
+        for chunk in chunks:
+            for sprite, cell in self.loaded.pop(chunk):
+                if sprite.alive():
+                    sprite.kill()
+                elif sprite.sprite_type == 'grass':
+                    self.cut_grass.add(cell)
+            self.static_layer.release(self.chunk_rect(chunk))
+
+        # monsters wander, they are stored in whatever chunk they stand in now
+        for enemy in self.enemy_sprites.sprites():
+            enemy_chunk = self.chunk_at(enemy.rect.topleft)
+            if enemy_chunk not in self.loaded:
+                self.stored_enemies.setdefault(enemy_chunk, []).append(
+                    (enemy.monster_name, enemy.rect.topleft, enemy.health)
+                )
+                enemy.kill()